@@ -0,0 +1,119 @@
+"""Объём данных для главной страницы с полным текстом постов и с excerpt.
+
+Для каждой длины текста измеряется, сколько байт страница читает из
+базы (сумма размеров значений во всех строках её SELECT-запросов),
+размер ответа и медиана времени запроса. Прежнее поведение
+воспроизводится в том же процессе: вместо text откладывается excerpt, а
+шаблон вместо excerpt получает полный текст.
+Запуск: ``python benchmarks/bench_excerpt.py``.
+"""
+from contextlib import ExitStack
+from unittest import mock
+
+from common import measure, print_table, setup_database
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Group, Post, make_excerpt
+
+User = get_user_model()
+
+POSTS = 200
+TEXT_LENGTHS = (500, 5000, 20000)
+
+
+def value_size(value):
+    if isinstance(value, str):
+        return len(value.encode())
+    if isinstance(value, bytes):
+        return len(value)
+    return len(str(value)) if value is not None else 0
+
+
+def bytes_read(client, url):
+    """Байты, прочитанные из базы SELECT-запросами страницы."""
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url)
+    total = 0
+    with connection.cursor() as cursor:
+        for query in queries:
+            if not query['sql'].startswith('SELECT'):
+                continue
+            cursor.execute(query['sql'])
+            total += sum(
+                value_size(value)
+                for row in cursor.fetchall() for value in row
+            )
+    return total
+
+
+def full_text():
+    """Списки читают text вместо excerpt и выводят его целиком."""
+    defer = QuerySet.defer
+    patches = (
+        mock.patch.object(
+            QuerySet, 'defer', lambda self, *_: defer(self, 'excerpt')
+        ),
+        mock.patch.object(
+            Post, 'excerpt', property(lambda post: post.text), create=True
+        ),
+    )
+    stack = ExitStack()
+    for patch in patches:
+        stack.enter_context(patch)
+    return stack
+
+
+def page_stats(client, url):
+    return (
+        bytes_read(client, url),
+        len(client.get(url).content),
+        measure(lambda: client.get(url)),
+    )
+
+
+def main():
+    setup_database()
+    author = User.objects.create_user(username='author')
+    group = Group.objects.create(title='Группа', slug='group')
+    client = Client()
+    url = reverse('posts:index')
+    rows = []
+    for length in TEXT_LENGTHS:
+        Post.objects.all().delete()
+        text = ('слово ' * length)[:length]
+        Post.objects.bulk_create(
+            Post(
+                text=text, excerpt=make_excerpt(text),
+                author=author, group=group,
+            )
+            for _ in range(POSTS)
+        )
+        after = page_stats(client, url)
+        with full_text():
+            before = page_stats(client, url)
+        rows.append((
+            length,
+            before[0], after[0],
+            before[1], after[1],
+            f'{before[2]:.1f}', f'{after[2]:.1f}',
+        ))
+    print(f'Постов в базе: {POSTS}, страница: {url}')
+    print_table(
+        (
+            'символов в посте',
+            'из базы, байт: текст', 'excerpt',
+            'ответ, байт: текст', 'excerpt',
+            'время, мс: текст', 'excerpt',
+        ),
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
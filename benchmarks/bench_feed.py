@@ -0,0 +1,77 @@
+"""Задержка ленты подписок в зависимости от числа подписок.
+
+Сравнивает первую страницу FollowFeed (лента с fan-out при записи) с
+наивной выборкой ``Post.objects.filter(author__in=...)`` по всей таблице
+постов, а также время ответа страницы /follow/ целиком (оно растёт
+из-за шаблона паджинатора, который выводит ссылку на каждую страницу).
+Запуск: ``python benchmarks/bench_feed.py``.
+"""
+from common import measure, print_table, setup_database
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.paginator import Paginator
+from django.test import Client
+from django.urls import reverse
+
+from posts.feed import FollowFeed, follow
+from posts.models import Follow, Post
+
+User = get_user_model()
+
+FOLLOW_COUNTS = (10, 100, 1000)
+POSTS_PER_AUTHOR = 5
+# Посты авторов, на которых читатель не подписан
+OTHER_POSTS = 20000
+
+
+def create_authors(prefix, count):
+    User.objects.bulk_create(
+        User(username=f'{prefix}{number}') for number in range(count)
+    )
+    authors = list(User.objects.filter(username__startswith=prefix))
+    Post.objects.bulk_create(
+        Post(text=f'Пост {number}', author=author)
+        for author in authors
+        for number in range(POSTS_PER_AUTHOR)
+    )
+    return authors
+
+
+def first_page(posts):
+    return list(Paginator(posts, settings.POSTS_ON_PAGE).get_page(1))
+
+
+def naive_feed(reader):
+    return first_page(Post.objects.filter(
+        author__in=Follow.objects.filter(user=reader).values('author')
+    ).select_related('author', 'group'))
+
+
+def main():
+    setup_database()
+    others = create_authors('other', OTHER_POSTS // POSTS_PER_AUTHOR)
+    rows = []
+    for count in FOLLOW_COUNTS:
+        reader = User.objects.create_user(username=f'reader{count}')
+        for author in create_authors(f'a{count}-', count):
+            follow(reader, author)
+        follow(reader, others[0])
+        client = Client()
+        client.force_login(reader)
+        url = reverse('posts:follow_index')
+        rows.append((
+            count,
+            f'{measure(lambda: first_page(FollowFeed(reader))):.2f}',
+            f'{measure(lambda: naive_feed(reader)):.2f}',
+            f'{measure(lambda: client.get(url)):.1f}',
+        ))
+    print(f'Постов в базе: {Post.objects.count()}')
+    print_table(
+        ('подписок', 'FollowFeed, мс', 'author__in, мс', '/follow/, мс'),
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
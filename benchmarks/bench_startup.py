@@ -0,0 +1,91 @@
+"""Время запуска процесса и первого запроса с прогревом и без.
+
+Каждый замер — отдельный процесс Python: импорт ``yatube.wsgi`` (без
+прогрева, WARMUP_ON_START выключен), затем ``warm_up()`` при замере с
+прогревом и два запроса к главной странице. Скрипт завершается с кодом 1,
+если запуск (импорт и прогрев) дольше бюджета.
+Запуск: ``python benchmarks/bench_startup.py [--budget-ms 3000]``.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from common import ROOT, print_table
+
+RUNS = 5
+CHILD = '''
+import json, os, sys, time
+sys.path.insert(0, {yatube!r})
+os.environ['DJANGO_SETTINGS_MODULE'] = 'yatube.settings_test'
+start = time.perf_counter()
+import django
+from django.conf import settings
+django.setup()
+settings.WARMUP_ON_START = False
+import yatube.wsgi
+result = {{'import': time.perf_counter() - start, 'warmup': 0}}
+from django.db import connection
+from django.test.utils import setup_test_environment
+setup_test_environment()
+connection.creation.create_test_db(verbosity=0)
+if {warm}:
+    from core.warmup import warm_up
+    result['warmup'] = warm_up()['seconds']
+from django.test import Client
+client = Client()
+for name in ('first', 'second'):
+    start = time.perf_counter()
+    client.get('/')
+    result[name] = time.perf_counter() - start
+print(json.dumps(result))
+'''
+
+
+def run(warm):
+    code = CHILD.format(yatube=os.path.join(ROOT, 'yatube'), warm=warm)
+    output = subprocess.run(
+        [sys.executable, '-c', code],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--budget-ms', type=float, default=3000)
+    budget = parser.parse_args().budget_ms
+    rows = []
+    worst = 0
+    for warm in (False, True):
+        runs = [run(warm) for _ in range(RUNS)]
+
+        def median(key):
+            return statistics.median(result[key] for result in runs) * 1000
+
+        worst = max(
+            worst,
+            max((result['import'] + result['warmup']) * 1000
+                for result in runs),
+        )
+        rows.append((
+            'да' if warm else 'нет',
+            f'{median("import"):.0f}',
+            f'{median("warmup"):.0f}',
+            f'{median("first"):.1f}',
+            f'{median("second"):.1f}',
+        ))
+    print_table(
+        ('прогрев', 'импорт, мс', 'прогрев, мс', '1-й запрос, мс',
+         '2-й запрос, мс'),
+        rows,
+    )
+    print(f'Самый долгий запуск: {worst:.0f} мс, бюджет: {budget:.0f} мс')
+    if worst > budget:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
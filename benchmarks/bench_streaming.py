@@ -0,0 +1,80 @@
+"""Время до первого байта для страниц со списком постов.
+
+Сравнивает обычный ``render()`` (страница строится целиком, прежде чем
+уйдёт первый байт) с потоковой отдачей ``STREAM_LIST_PAGES``, при которой
+шапка страницы уходит до запросов за постами. Для каждого размера
+страницы измеряется время до первой части ответа и до последней.
+Запуск: ``python benchmarks/bench_streaming.py``.
+"""
+import time
+
+from common import print_table, setup_database
+
+from django.contrib.auth import get_user_model
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+POSTS = 20000
+PAGE_SIZES = (10, 50, 200)
+
+
+def first_byte(client, url):
+    start = time.perf_counter()
+    response = client.get(url)
+    if response.streaming:
+        chunks = iter(response.streaming_content)
+        next(chunks)
+        ttfb = time.perf_counter() - start
+        b''.join(chunks)
+    else:
+        ttfb = time.perf_counter() - start
+    return ttfb * 1000, (time.perf_counter() - start) * 1000
+
+
+def median_pair(client, url, repeat=20):
+    timings = [first_byte(client, url) for _ in range(repeat + 1)][1:]
+    ttfb = sorted(timing[0] for timing in timings)[repeat // 2]
+    total = sorted(timing[1] for timing in timings)[repeat // 2]
+    return ttfb, total
+
+
+def main():
+    setup_database()
+    author = User.objects.create_user(username='author')
+    group = Group.objects.create(title='Группа', slug='group')
+    Post.objects.bulk_create(
+        Post(
+            text=f'Пост {number} ' * 20, excerpt=f'Пост {number} ' * 20,
+            author=author, group=group,
+        )
+        for number in range(POSTS)
+    )
+    client = Client()
+    url = reverse('posts:index')
+    rows = []
+    for size in PAGE_SIZES:
+        row = [size]
+        for stream in (False, True):
+            with override_settings(
+                POSTS_ON_PAGE=size, STREAM_LIST_PAGES=stream
+            ):
+                ttfb, total = median_pair(client, url)
+            row.extend((f'{ttfb:.1f}', f'{total:.1f}'))
+        rows.append(row)
+    print(f'Постов в базе: {Post.objects.count()}, страница: {url}')
+    print_table(
+        (
+            'постов на странице',
+            'render TTFB, мс', 'render всего, мс',
+            'stream TTFB, мс', 'stream всего, мс',
+        ),
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Общая подготовка окружения для бенчмарков.
+
+Бенчмарки запускаются из корня репозитория, например
+``python benchmarks/bench_feed.py``, с профилем настроек
+``yatube.settings_test``: база создаётся в памяти и после
+запуска не остаётся.
+"""
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'yatube'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings_test')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+
+def setup_database():
+    """Создаёт тестовую базу и включает тестовое окружение Django."""
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+
+
+def measure(func, repeat=20):
+    """Медиана времени выполнения func в миллисекундах."""
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def print_table(header, rows):
+    widths = [
+        max(len(str(cell)) for cell in column)
+        for column in zip(header, *rows)
+    ]
+    for row in (header, *rows):
+        print('  '.join(
+            str(cell).rjust(width) for cell, width in zip(row, widths)
+        ))
@@ -0,0 +1,29 @@
+from django.contrib import admin
+
+from core.models import QueuedEmail, Task
+
+
+class TaskAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'name',
+        'status',
+        'attempts',
+        'run_at',
+    )
+    list_filter = ('status', 'name')
+    empty_value_display = '-пусто-'
+
+
+class QueuedEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'created',
+        'attempts',
+    )
+    exclude = ('message',)
+    empty_value_display = '-пусто-'
+
+
+admin.site.register(Task, TaskAdmin)
+admin.site.register(QueuedEmail, QueuedEmailAdmin)
@@ -0,0 +1,46 @@
+from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from core.metrics import registry
+
+MISSING = object()
+
+
+class MetricsMixin:
+    """Считает попадания и промахи кеша в yatube_cache_requests_total.
+
+    get_many() кеша в памяти вызывает get() для каждого ключа, поэтому
+    учитываются и пакетные чтения.
+    """
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, MISSING, version)
+        registry.inc(
+            'yatube_cache_requests_total',
+            (('result', 'miss' if value is MISSING else 'hit'),),
+        )
+        return default if value is MISSING else value
+
+
+class InstrumentedDatabaseCache(DatabaseCache):
+    """Кеш в базе со счётчиком yatube_cache_requests_total.
+
+    DatabaseCache читает ключи одним запросом, а get() сводится к
+    get_many(), поэтому обращения считаются только здесь.
+    """
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = super().get_many(keys, version)
+        registry.inc(
+            'yatube_cache_requests_total', (('result', 'hit'),), len(found)
+        )
+        registry.inc(
+            'yatube_cache_requests_total', (('result', 'miss'),),
+            len(keys) - len(found),
+        )
+        return found
+
+
+class InstrumentedLocMemCache(MetricsMixin, LocMemCache):
+    pass
@@ -0,0 +1,55 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from PIL import features
+from sorl.thumbnail import get_thumbnail
+
+WEBP_SUPPORTED = features.check('webp')
+
+
+def rendition_geometry(width):
+    ratio_width, ratio_height = settings.POST_IMAGE_RATIO
+    return f'{width}x{round(width * ratio_height / ratio_width)}'
+
+
+def _rendition(image, width, **options):
+    thumbnail = get_thumbnail(
+        image, rendition_geometry(width),
+        crop='center', upscale=True, **options
+    )
+    return {
+        'url': thumbnail.url,
+        'width': thumbnail.width,
+        'height': thumbnail.height,
+        'bytes': thumbnail.storage.size(thumbnail.name),
+    }
+
+
+def renditions_key(name):
+    """Ключ кеша с набором копий картинки name."""
+    return 'renditions:' + hashlib.md5(
+        f'{name}:{settings.POST_IMAGE_RENDITIONS}:'
+        f'{settings.POST_IMAGE_RATIO}'.encode()
+    ).hexdigest()
+
+
+def renditions(image):
+    """Набор уменьшенных копий картинки для srcset.
+
+    Возвращает словарь со списками 'fallback' (JPEG) и 'webp' (пустой,
+    если Pillow собран без WebP). Копии создаются sorl-thumbnail один раз,
+    а готовый набор кешируется по имени файла.
+    """
+    widths = settings.POST_IMAGE_RENDITIONS
+    key = renditions_key(image.name)
+    result = cache.get(key)
+    if result is None:
+        result = {
+            'fallback': [_rendition(image, width) for width in widths],
+            'webp': [
+                _rendition(image, width, format='WEBP') for width in widths
+            ] if WEBP_SUPPORTED else [],
+        }
+        cache.set(key, result, None)
+    return result
@@ -0,0 +1,100 @@
+import logging
+import pickle
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.models import QueuedEmail
+
+logger = logging.getLogger(__name__)
+
+
+def serialize(message):
+    connection, message.connection = message.connection, None
+    try:
+        return pickle.dumps(message)
+    finally:
+        message.connection = connection
+
+
+def deserialize(data):
+    return pickle.loads(bytes(data))
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Сохраняет письма в очередь вместо отправки.
+
+    Запрос завершается сразу после записи в базу, а доставкой занимается
+    команда flush_mail через EMAIL_DELIVERY_BACKEND.
+    """
+
+    def send_messages(self, email_messages):
+        messages = [
+            message for message in email_messages if message.recipients()
+        ]
+        QueuedEmail.objects.bulk_create(
+            QueuedEmail(message=serialize(message)) for message in messages
+        )
+        return len(messages)
+
+
+def claim(after_pk, batch_size, max_attempts):
+    """Забирает пачку писем с pk больше after_pk, как core.tasks.claim.
+
+    Письмо, взятое другим процессом, пропускается, пока не истечёт
+    EMAIL_QUEUE_LOCK_TIMEOUT: тогда его отправитель считается упавшим.
+    """
+    token = uuid.uuid4().hex
+    now = timezone.now()
+    available = QueuedEmail.objects.filter(
+        Q(locked_by='') | Q(locked_at__lt=now - timedelta(
+            seconds=settings.EMAIL_QUEUE_LOCK_TIMEOUT
+        )),
+        attempts__lt=max_attempts,
+        pk__gt=after_pk,
+    )
+    with transaction.atomic():
+        ids = list(available.values_list('pk', flat=True)[:batch_size])
+        available.filter(pk__in=ids).update(locked_by=token, locked_at=now)
+    return list(QueuedEmail.objects.filter(locked_by=token))
+
+
+def flush(batch_size, max_attempts):
+    """Отправляет накопленные письма через одно соединение.
+
+    Письма забираются из очереди пачками по batch_size, поэтому несколько
+    процессов flush_mail не отправят одно письмо дважды. Отправленные
+    удаляются, неотправленные возвращаются в очередь до max_attempts
+    попыток. Возвращает пару (отправлено, с ошибкой).
+    """
+    sent = failed = 0
+    last_pk = 0
+    with get_connection(settings.EMAIL_DELIVERY_BACKEND) as connection:
+        while True:
+            batch = claim(last_pk, batch_size, max_attempts)
+            if not batch:
+                return sent, failed
+            last_pk = batch[-1].pk
+            delivered = []
+            for queued in batch:
+                try:
+                    connection.send_messages([deserialize(queued.message)])
+                except Exception as error:
+                    logger.exception('Письмо #%s не отправлено', queued.pk)
+                    QueuedEmail.objects.filter(pk=queued.pk).update(
+                        attempts=F('attempts') + 1,
+                        last_error=repr(error),
+                        locked_by='',
+                        locked_at=None,
+                    )
+                    failed += 1
+                else:
+                    delivered.append(queued.pk)
+            QueuedEmail.objects.filter(pk__in=delivered).delete()
+            sent += len(delivered)
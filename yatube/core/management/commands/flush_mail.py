@@ -0,0 +1,37 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.mail import flush
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди пачками через одно соединение.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.EMAIL_QUEUE_BATCH_SIZE,
+            help='Сколько писем читать из очереди за раз.',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а проверять очередь каждые '
+                 'EMAIL_QUEUE_FLUSH_INTERVAL секунд.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = flush(
+                options['batch_size'], settings.EMAIL_QUEUE_MAX_ATTEMPTS
+            )
+            if sent or failed:
+                self.stdout.write(
+                    f'Отправлено: {sent}, с ошибкой: {failed}'
+                )
+            if not options['loop']:
+                return
+            time.sleep(settings.EMAIL_QUEUE_FLUSH_INTERVAL)
@@ -0,0 +1,47 @@
+import glob
+import os
+import pstats
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Объединяет сохранённые профили запросов и выводит узкие места.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'view_names',
+            nargs='*',
+            help='Имена URL, например posts:profile. По умолчанию — все.',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=30,
+            help='Сколько функций вывести.',
+        )
+        parser.add_argument(
+            '--sort',
+            default='cumulative',
+            help='Ключ сортировки pstats: cumulative, tottime, ncalls.',
+        )
+
+    def handle(self, *args, **options):
+        directories = [
+            name.replace(':', '.') for name in options['view_names']
+        ] or ['*']
+        paths = sorted(
+            path
+            for directory in directories
+            for path in glob.glob(os.path.join(
+                settings.PROFILING_ROOT, directory, '*.pstats'
+            ))
+        )
+        if not paths:
+            raise CommandError('Сохранённых профилей не найдено.')
+        stats = pstats.Stats(*paths, stream=self.stdout)
+        self.stdout.write(f'Профилей: {len(paths)}')
+        stats.strip_dirs().sort_stats(options['sort']).print_stats(
+            options['limit']
+        )
@@ -0,0 +1,49 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.tasks import claim, execute, release_stale
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди в пуле потоков.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.TASKS_WORKERS,
+            help='Количество потоков-обработчиков.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить готовые задачи и завершиться.',
+        )
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while True:
+                release_stale(settings.TASKS_LOCK_TIMEOUT)
+                batch = claim(workers)
+                if batch:
+                    results = list(pool.map(self.run, batch))
+                    self.stdout.write(
+                        f'Выполнено: {sum(results)}, '
+                        f'с ошибкой: {len(results) - sum(results)}'
+                    )
+                    continue
+                if options['once']:
+                    return
+                time.sleep(settings.TASKS_POLL_INTERVAL)
+
+    @staticmethod
+    def run(queued):
+        try:
+            return execute(queued)
+        finally:
+            connections.close_all()
@@ -0,0 +1,61 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def log_files():
+    path = settings.SLOW_QUERY_LOG_FILE
+    backups = (
+        f'{path}.{number}'
+        for number in range(settings.SLOW_QUERY_LOG_BACKUPS, 0, -1)
+    )
+    return [name for name in (*backups, path) if os.path.exists(name)]
+
+
+class Command(BaseCommand):
+    help = 'Сводка по медленным запросам из журнала, включая ротации.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=10,
+            help='Сколько запросов вывести.',
+        )
+
+    def handle(self, *args, **options):
+        paths = log_files()
+        if not paths:
+            raise CommandError('Журнал медленных запросов пуст.')
+        queries = {}
+        for path in paths:
+            with open(path, encoding='utf-8') as log:
+                for line in log:
+                    entry = json.loads(line)
+                    query = queries.setdefault(entry['fingerprint'], {
+                        'sql': entry['sql'],
+                        'count': 0,
+                        'total': 0,
+                        'max': 0,
+                        'views': set(),
+                    })
+                    query['count'] += 1
+                    query['total'] += entry['duration_ms']
+                    query['max'] = max(query['max'], entry['duration_ms'])
+                    query['views'].add(entry['view'] or '-')
+                    query['plan'] = entry['plan'] or query.get('plan', [])
+        top = sorted(
+            queries.items(), key=lambda item: item[1]['total'], reverse=True
+        )[:options['limit']]
+        for key, query in top:
+            self.stdout.write(
+                f'[{key}] раз: {query["count"]}, '
+                f'всего: {query["total"]:.1f} мс, '
+                f'максимум: {query["max"]:.1f} мс, '
+                f'view: {", ".join(sorted(query["views"]))}'
+            )
+            self.stdout.write(f'  {query["sql"]}')
+            for row in query['plan']:
+                self.stdout.write(f'    {row}')
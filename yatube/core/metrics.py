@@ -0,0 +1,218 @@
+import atexit
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+METRICS = {
+    'yatube_requests_total': (
+        'counter', 'Ответы по имени URL и коду статуса.'
+    ),
+    'yatube_request_duration_seconds': (
+        'histogram', 'Время обработки запроса по имени URL.'
+    ),
+    'yatube_db_queries_per_request': (
+        'histogram', 'Число запросов к базе на один запрос по имени URL.'
+    ),
+    'yatube_template_render_seconds': (
+        'histogram', 'Время рендеринга шаблона.'
+    ),
+    'yatube_cache_requests_total': (
+        'counter', 'Обращения к кешу: попадания и промахи.'
+    ),
+}
+
+
+def format_bound(bound):
+    return '+Inf' if bound == float('inf') else repr(float(bound))
+
+
+def snapshot_alive(path):
+    """Жив ли процесс, записавший снимок <pid>-<случайная часть>.json."""
+    pid = os.path.basename(path).split('-', 1)[0]
+    if not pid.isdigit():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class Registry:
+    """Счётчики и гистограммы процесса.
+
+    Каждый поток пишет в свой словарь без блокировок, блокировка нужна
+    только при появлении нового потока и при чтении. Снимок процесса раз в
+    METRICS_FLUSH_INTERVAL секунд записывается в METRICS_ROOT, чтобы
+    /metrics/ мог сложить значения всех рабочих процессов. Снимки
+    завершившихся процессов удаляются при сборе.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Начинает счёт заново под новым именем снимка.
+
+        Вызывается и в дочернем процессе после fork: иначе рабочие
+        процессы, запущенные из одного мастера (gunicorn --preload),
+        писали бы снимки в один файл и считали значения мастера своими.
+        """
+        self.local = threading.local()
+        self.shards = []
+        self.lock = threading.Lock()
+        self.name = f'{os.getpid()}-{uuid.uuid4().hex[:8]}'
+        self.last_flush = time.monotonic()
+
+    def shard(self):
+        shard = getattr(self.local, 'shard', None)
+        if shard is None:
+            shard = self.local.shard = defaultdict(float)
+            with self.lock:
+                self.shards.append(shard)
+        return shard
+
+    def inc(self, name, labels=(), value=1):
+        self.shard()[name, labels] += value
+
+    def observe(self, name, labels, value, buckets):
+        shard = self.shard()
+        for bound in (*buckets, float('inf')):
+            shard[
+                f'{name}_bucket', (*labels, ('le', format_bound(bound)))
+            ] += value <= bound
+        shard[f'{name}_sum', labels] += value
+        shard[f'{name}_count', labels] += 1
+
+    def snapshot(self):
+        with self.lock:
+            shards = list(self.shards)
+        merged = defaultdict(float)
+        for shard in shards:
+            for key, value in list(shard.items()):
+                merged[key] += value
+        return merged
+
+    def path(self):
+        return os.path.join(settings.METRICS_ROOT, f'{self.name}.json')
+
+    def flush(self):
+        """Записывает снимок процесса в METRICS_ROOT."""
+        os.makedirs(settings.METRICS_ROOT, exist_ok=True)
+        rows = [
+            [name, [list(label) for label in labels], value]
+            for (name, labels), value in self.snapshot().items()
+        ]
+        descriptor, temp_path = tempfile.mkstemp(
+            dir=settings.METRICS_ROOT, prefix='.metrics-'
+        )
+        with os.fdopen(descriptor, 'w') as temp_file:
+            json.dump(rows, temp_file)
+        os.replace(temp_path, self.path())
+
+    def maybe_flush(self):
+        interval = settings.METRICS_FLUSH_INTERVAL
+        if interval is None:
+            return
+        now = time.monotonic()
+        if now - self.last_flush >= interval:
+            self.last_flush = now
+            self.flush()
+
+    def collect(self):
+        """Значения всех процессов: свои из памяти, чужие из снимков."""
+        merged = self.snapshot()
+        own = self.path()
+        for path in glob.glob(os.path.join(settings.METRICS_ROOT, '*.json')):
+            if path == own:
+                continue
+            if not snapshot_alive(path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            try:
+                with open(path) as snapshot:
+                    rows = json.load(snapshot)
+            except (OSError, ValueError):
+                continue
+            for name, labels, value in rows:
+                merged[name, tuple(tuple(label) for label in labels)] += value
+        return merged
+
+
+def format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(
+            key,
+            str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'),
+        )
+        for key, value in labels
+    )
+    return f'{{{pairs}}}'
+
+
+def sample_order(item):
+    (name, labels), _ = item
+    labels = dict(labels)
+    le = labels.pop('le', None)
+    bound = float(le) if le is not None else 0
+    suffix = name.rsplit('_', 1)[-1]
+    return (
+        sorted(labels.items()),
+        {'bucket': 0, 'sum': 1, 'count': 2}.get(suffix, 0),
+        bound,
+    )
+
+
+def render_prometheus(values):
+    """Текстовый формат Prometheus 0.0.4."""
+    lines = []
+    for base, (kind, help_text) in METRICS.items():
+        samples = sorted(
+            (
+                item for item in values.items()
+                if item[0][0] == base
+                or item[0][0] in (
+                    f'{base}_bucket', f'{base}_sum', f'{base}_count'
+                )
+            ),
+            key=sample_order,
+        )
+        lines.append(f'# HELP {base} {help_text}')
+        lines.append(f'# TYPE {base} {kind}')
+        for (name, labels), value in samples:
+            lines.append(
+                f'{name}{format_labels(labels)} {format_value(value)}'
+            )
+    return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+os.register_at_fork(after_in_child=registry.reset)
+
+
+@atexit.register
+def flush_on_exit():
+    if settings.METRICS_FLUSH_INTERVAL is not None:
+        registry.flush()
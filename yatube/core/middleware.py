@@ -0,0 +1,184 @@
+import cProfile
+import os
+import random
+import time
+import uuid
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+from django.urls import Resolver404, resolve
+from django.utils import timezone
+
+from core.metrics import LATENCY_BUCKETS, QUERY_BUCKETS, registry
+from core.slow_queries import SlowQueryLogger
+
+
+@contextmanager
+def instrument(wrapper):
+    """Подключает execute_wrapper ко всем соединениям с базой."""
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(wrapper))
+        yield
+
+
+def profile_requested(request):
+    """Профилировать ли запрос: по просьбе сотрудника или по выборке."""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_staff and (
+        request.GET.get('profile') or request.META.get('HTTP_X_PROFILE')
+    ):
+        return True
+    rate = settings.PROFILING_SAMPLE_RATE
+    return rate > 0 and random.random() < rate
+
+
+def profile_path(view_name):
+    directory = os.path.join(
+        settings.PROFILING_ROOT, (view_name or 'unnamed').replace(':', '.')
+    )
+    os.makedirs(directory, exist_ok=True)
+    name = '{}-{}.pstats'.format(
+        timezone.now().strftime('%Y%m%d-%H%M%S'), uuid.uuid4().hex[:8]
+    )
+    return os.path.join(directory, name)
+
+
+class ProfilingMiddleware:
+    """Запускает view под cProfile и сохраняет .pstats по имени URL.
+
+    Профилируются запросы сотрудников с параметром ?profile=1 или
+    заголовком X-Profile, а также доля PROFILING_SAMPLE_RATE всех
+    запросов. Для потоковых ответов профилируется и отдача частей.
+    Файлы собирает команда profile_report.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not profile_requested(request):
+            return None
+        path = profile_path(request.resolver_match.view_name)
+        profiler = cProfile.Profile()
+        response = profiler.runcall(
+            view_func, request, *view_args, **view_kwargs
+        )
+        if getattr(response, 'streaming', False):
+            response.streaming_content = self.profile_stream(
+                profiler, response.streaming_content, path
+            )
+        else:
+            profiler.dump_stats(path)
+        return response
+
+    def profile_stream(self, profiler, content, path):
+        content = iter(content)
+        while True:
+            profiler.enable()
+            try:
+                chunk = next(content)
+            except StopIteration:
+                break
+            finally:
+                profiler.disable()
+            yield chunk
+        profiler.dump_stats(path)
+
+
+class SlowQueryMiddleware:
+    """Записывает медленные запросы к базе, сделанные при обработке запроса.
+
+    Для потоковых ответов учитываются и запросы во время отдачи частей.
+    При SLOW_QUERY_THRESHOLD_MS = None ничего не делает.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if settings.SLOW_QUERY_THRESHOLD_MS is None:
+            return self.get_response(request)
+        wrapper = SlowQueryLogger(request)
+        with instrument(wrapper):
+            response = self.get_response(request)
+        if response.streaming:
+            response.streaming_content = self.instrument_stream(
+                wrapper, response.streaming_content
+            )
+        return response
+
+    def instrument_stream(self, wrapper, content):
+        with instrument(wrapper):
+            yield from content
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    """Собирает метрики запросов для /metrics/.
+
+    Стоит первым, чтобы учитывать и страницы из кеша: время ответа, код
+    статуса и число запросов к базе по имени URL. Для потоковых ответов
+    замер заканчивается после отдачи последней части.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        counter = QueryCounter()
+        with instrument(counter):
+            response = self.get_response(request)
+        if response.streaming:
+            response.streaming_content = self.observe_stream(
+                request, response, response.streaming_content, counter, start
+            )
+        else:
+            self.observe(request, response, counter, start)
+        return response
+
+    def observe_stream(self, request, response, content, counter, start):
+        try:
+            with instrument(counter):
+                yield from content
+        finally:
+            self.observe(request, response, counter, start)
+
+    def observe(self, request, response, counter, start):
+        view = (('view', view_name(request)),)
+        registry.inc(
+            'yatube_requests_total',
+            (*view, ('status', str(response.status_code))),
+        )
+        registry.observe(
+            'yatube_request_duration_seconds', view,
+            time.perf_counter() - start, LATENCY_BUCKETS,
+        )
+        registry.observe(
+            'yatube_db_queries_per_request', view,
+            counter.count, QUERY_BUCKETS,
+        )
+        registry.maybe_flush()
+
+
+def view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return 'unresolved'
+    return match.view_name
@@ -0,0 +1,23 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_queuedemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='queuedemail',
+            name='locked_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Взято в отправку'),
+        ),
+        migrations.AddField(
+            model_name='queuedemail',
+            name='locked_by',
+            field=models.CharField(blank=True, max_length=64, verbose_name='Отправитель'),
+        ),
+    ]
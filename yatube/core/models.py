@@ -0,0 +1,95 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Task(models.Model):
+    """Отложенный вызов функции, помеченной декоратором core.tasks.task."""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(
+        max_length=255,
+        verbose_name='Задача',
+        help_text='Путь к функции задачи'
+    )
+    payload = models.TextField(
+        verbose_name='Аргументы',
+        help_text='Аргументы задачи в формате JSON'
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name='Статус'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток'
+    )
+    run_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Запустить не раньше'
+    )
+    locked_by = models.CharField(
+        max_length=64,
+        blank=True,
+        verbose_name='Обработчик'
+    )
+    locked_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name='Взята в работу'
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Последняя ошибка'
+    )
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        ordering = ('run_at',)
+        indexes = (
+            models.Index(fields=('status', 'run_at')),
+        )
+        verbose_name = 'Задача'
+        verbose_name_plural = 'Задачи'
+
+
+class QueuedEmail(models.Model):
+    """Письмо, ожидающее отправки командой flush_mail."""
+    message = models.BinaryField(verbose_name='Письмо')
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Поставлено в очередь'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток'
+    )
+    locked_by = models.CharField(
+        max_length=64,
+        blank=True,
+        verbose_name='Отправитель'
+    )
+    locked_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name='Взято в отправку'
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Последняя ошибка'
+    )
+
+    class Meta:
+        ordering = ('pk',)
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Письма в очереди'
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+
+from django.conf import settings
+
+NUMBER_RE = re.compile(r'\b\d+(\.\d+)?\b')
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+IN_LIST_RE = re.compile(r'IN \((?:\?, )*\?\)')
+SPACE_RE = re.compile(r'\s+')
+
+_loggers = {}
+_loggers_lock = threading.Lock()
+
+
+def normalize_sql(sql):
+    """SQL без значений: одинаковые запросы с разными параметрами совпадают."""
+    sql = sql.replace('%s', '?')
+    sql = STRING_RE.sub('?', sql)
+    sql = NUMBER_RE.sub('?', sql)
+    sql = IN_LIST_RE.sub('IN (...)', sql)
+    return SPACE_RE.sub(' ', sql).strip()
+
+
+def fingerprint(normalized):
+    return hashlib.md5(normalized.encode()).hexdigest()[:12]
+
+
+def get_logger(path):
+    """Логгер с ротацией файла; создаётся при первой медленной записи."""
+    with _loggers_lock:
+        if path not in _loggers:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            logger = logging.getLogger(f'{__name__}.{len(_loggers)}')
+            logger.propagate = False
+            logger.setLevel(logging.INFO)
+            handler = RotatingFileHandler(
+                path,
+                maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+                backupCount=settings.SLOW_QUERY_LOG_BACKUPS,
+                encoding='utf-8',
+            )
+            logger.addHandler(handler)
+            _loggers[path] = logger
+        return _loggers[path]
+
+
+def explain(connection, sql, params):
+    """План запроса отдельным курсором, в обход обёрток Django."""
+    prefix = (
+        'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+    )
+    cursor = connection.create_cursor()
+    try:
+        cursor.execute(prefix + sql, params)
+        return [
+            ' '.join(str(column) for column in row)
+            for row in cursor.fetchall()
+        ]
+    except Exception as error:
+        return [f'EXPLAIN не выполнен: {error}']
+    finally:
+        cursor.close()
+
+
+class SlowQueryLogger:
+    """Обёртка выполнения запросов (connection.execute_wrapper).
+
+    Запросы дольше SLOW_QUERY_THRESHOLD_MS записываются одной JSON-строкой
+    в SLOW_QUERY_LOG_FILE: нормализованный SQL и его отпечаток, view, время
+    и план выполнения, снятый сразу после запроса. Отчёт по повторяющимся
+    запросам собирает команда slow_queries.
+    """
+
+    def __init__(self, request=None):
+        self.request = request
+
+    def view_name(self):
+        match = getattr(self.request, 'resolver_match', None)
+        return match.view_name if match is not None else None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (time.perf_counter() - start) * 1000
+            if duration >= settings.SLOW_QUERY_THRESHOLD_MS:
+                self.log(sql, params, many, context, duration)
+
+    def log(self, sql, params, many, context, duration):
+        normalized = normalize_sql(sql)
+        plan = []
+        if not many and sql.lstrip().upper().startswith('SELECT'):
+            plan = explain(context['connection'], sql, params)
+        get_logger(settings.SLOW_QUERY_LOG_FILE).info(json.dumps({
+            'time': time.time(),
+            'fingerprint': fingerprint(normalized),
+            'sql': normalized,
+            'view': self.view_name(),
+            'duration_ms': round(duration, 2),
+            'plan': plan,
+        }, ensure_ascii=False))
@@ -0,0 +1,218 @@
+import hashlib
+import os
+import posixpath
+import tempfile
+import threading
+from collections import OrderedDict
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, Storage
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+from django.utils.encoding import filepath_to_uri
+
+
+class MemoryStore:
+    """Файлы в памяти процесса с ограничением общего размера.
+
+    При превышении max_size вытесняются файлы, к которым дольше всего
+    не обращались.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.files = OrderedDict()
+        self.total_size = 0
+        self.lock = threading.Lock()
+
+    def get(self, name, touch=True):
+        with self.lock:
+            if name not in self.files:
+                raise FileNotFoundError(name)
+            if touch:
+                self.files.move_to_end(name)
+            return self.files[name]
+
+    def put(self, name, data):
+        with self.lock:
+            self._pop(name)
+            self.files[name] = (data, timezone.now())
+            self.total_size += len(data)
+            while self.total_size > self.max_size and len(self.files) > 1:
+                self._pop(next(iter(self.files)))
+
+    def pop(self, name):
+        with self.lock:
+            self._pop(name)
+
+    def _pop(self, name):
+        data, _ = self.files.pop(name, (b'', None))
+        self.total_size -= len(data)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(location, max_size):
+    with _stores_lock:
+        if location not in _stores:
+            _stores[location] = MemoryStore(max_size)
+        return _stores[location]
+
+
+@deconstructible
+class InMemoryStorage(Storage):
+    """Хранилище файлов в памяти процесса.
+
+    Экземпляры с одинаковым location делят общее хранилище, поэтому
+    ImageField и sorl-thumbnail видят одни и те же файлы. Объём
+    ограничен MEDIA_MEMORY_MAX_SIZE, старые файлы вытесняются (LRU).
+    Подходит для тестов и временных стендов без диска.
+    """
+
+    def __init__(self, location='default', base_url=None, max_size=None):
+        self._location = location
+        self._base_url = base_url
+        self._max_size = max_size
+
+    @property
+    def store(self):
+        max_size = self._max_size
+        if max_size is None:
+            max_size = settings.MEDIA_MEMORY_MAX_SIZE
+        return get_store(self._location, max_size)
+
+    @property
+    def base_url(self):
+        if self._base_url is not None:
+            return self._base_url
+        return settings.MEDIA_URL
+
+    def clear(self):
+        with self.store.lock:
+            self.store.files.clear()
+            self.store.total_size = 0
+
+    def _open(self, name, mode='rb'):
+        content, _ = self.store.get(name)
+        return ContentFile(content, name=name)
+
+    def _save(self, name, content):
+        data = b''.join(
+            chunk if isinstance(chunk, bytes) else chunk.encode()
+            for chunk in content.chunks()
+        )
+        self.store.put(name, data)
+        return name
+
+    def delete(self, name):
+        self.store.pop(name)
+
+    def exists(self, name):
+        return name in self.store.files
+
+    def listdir(self, path):
+        prefix = path.rstrip('/') + '/' if path else ''
+        directories, files = set(), []
+        with self.store.lock:
+            names = list(self.store.files)
+        for name in names:
+            if not name.startswith(prefix):
+                continue
+            head, sep, tail = name[len(prefix):].partition('/')
+            if sep:
+                directories.add(head)
+            else:
+                files.append(head)
+        return sorted(directories), sorted(files)
+
+    def size(self, name):
+        return len(self.store.get(name, touch=False)[0])
+
+    def url(self, name):
+        return urljoin(self.base_url, filepath_to_uri(name))
+
+    def get_modified_time(self, name):
+        return self.store.get(name, touch=False)[1]
+
+    get_created_time = get_accessed_time = get_modified_time
+
+
+def content_name(name, digest):
+    """Имя файла по хешу содержимого: <каталог>/<ab>/<хеш><расширение>."""
+    directory, filename = posixpath.split(name)
+    extension = os.path.splitext(filename)[1].lower()
+    return posixpath.join(directory, digest[:2], digest + extension)
+
+
+def is_content_name(name):
+    digest = os.path.splitext(posixpath.basename(name))[0]
+    return (
+        len(digest) == 64
+        and posixpath.basename(posixpath.dirname(name)) == digest[:2]
+    )
+
+
+def default_file_mode():
+    """Права нового файла по umask процесса, как у обычного open()."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def file_digest(content):
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """Файловое хранилище, в котором имя файла — SHA-256 содержимого.
+
+    Содержимое хешируется прямо во время записи во временный файл, после
+    чего файл переименовывается в content_name(). Если такой файл уже
+    есть, временный удаляется и возвращается имя существующего: каждая
+    картинка хранится один раз, а sorl-thumbnail находит для неё уже
+    готовые миниатюры.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def _save(self, name, content):
+        directory = self.path(posixpath.dirname(name))
+        os.makedirs(directory, exist_ok=True)
+        digest = hashlib.sha256()
+        descriptor, temp_path = tempfile.mkstemp(
+            dir=directory, prefix='.upload-'
+        )
+        try:
+            with os.fdopen(descriptor, 'wb') as temp_file:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    temp_file.write(chunk)
+            name = content_name(name, digest.hexdigest())
+            full_path = self.path(name)
+            if os.path.exists(full_path):
+                os.remove(temp_path)
+            else:
+                # mkstemp создаёт файл с правами 0600, которые закрыли бы
+                # картинку от веб-сервера, работающего под другим
+                # пользователем
+                mode = self.file_permissions_mode
+                os.chmod(
+                    temp_path,
+                    default_file_mode() if mode is None else mode,
+                )
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                os.replace(temp_path, full_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return name
@@ -0,0 +1,39 @@
+import uuid
+
+from django.http import StreamingHttpResponse
+from django.template.context import make_context
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+
+def stream_list(request, template_name, context, items, item_template,
+                item_name, separator='', prepare=None):
+    """Отдаёт страницу со списком по частям.
+
+    Страница рендерится с меткой stream_marker на месте списка, поэтому
+    разметка до списка (шапка, стили) уходит клиенту сразу. Затем
+    prepare(items) выполняет запросы к базе, и элементы списка
+    отправляются по одному, каждый — через item_template с общим
+    контекстом, для которого контекстные процессоры вызываются один раз.
+    """
+    marker = f'<!--stream-{uuid.uuid4().hex}-->'
+    page = get_template(template_name).render(
+        {**context, 'stream_marker': mark_safe(marker)}, request
+    )
+    head, tail = page.split(marker)
+
+    def chunks():
+        yield head
+        if prepare is not None:
+            prepare(items)
+        template = get_template(item_template).template
+        item_context = make_context(context, request)
+        with item_context.bind_template(template):
+            for number, item in enumerate(items):
+                if number:
+                    yield separator
+                with item_context.push({item_name: item}):
+                    yield template.render(item_context)
+        yield tail
+
+    return StreamingHttpResponse(chunks())
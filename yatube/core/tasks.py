@@ -0,0 +1,103 @@
+import json
+import logging
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from core.models import Task
+
+logger = logging.getLogger(__name__)
+
+
+def task(func):
+    """Регистрирует функцию как фоновую задачу.
+
+    У функции появляется метод delay(), который ставит вызов в очередь.
+    Аргументы должны сериализоваться в JSON.
+    """
+    func.task_name = f'{func.__module__}.{func.__qualname__}'
+    func.delay = lambda *args, **kwargs: enqueue(func, *args, **kwargs)
+    return func
+
+
+def enqueue(func, *args, **kwargs):
+    """Ставит задачу в очередь одним INSERT.
+
+    При TASKS_ALWAYS_EAGER задача выполняется сразу, без очереди.
+    """
+    if settings.TASKS_ALWAYS_EAGER:
+        func(*args, **kwargs)
+        return None
+    return Task.objects.create(
+        name=func.task_name,
+        payload=json.dumps({'args': args, 'kwargs': kwargs}),
+    )
+
+
+def get_task_function(name):
+    func = import_string(name)
+    if getattr(func, 'task_name', None) != name:
+        raise ImportError(f'{name} не является фоновой задачей')
+    return func
+
+
+def release_stale(timeout):
+    """Возвращает в очередь задачи, зависшие у упавших обработчиков."""
+    return Task.objects.filter(
+        status=Task.RUNNING,
+        locked_at__lt=timezone.now() - timedelta(seconds=timeout),
+    ).update(status=Task.PENDING, locked_by='', locked_at=None)
+
+
+def claim(limit):
+    """Забирает из очереди до limit готовых к запуску задач."""
+    token = uuid.uuid4().hex
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            Task.objects.filter(status=Task.PENDING, run_at__lte=now)
+            .values_list('pk', flat=True)[:limit]
+        )
+        Task.objects.filter(pk__in=ids, status=Task.PENDING).update(
+            status=Task.RUNNING, locked_by=token, locked_at=now,
+        )
+    return list(Task.objects.filter(locked_by=token, status=Task.RUNNING))
+
+
+def retry_delay(attempts):
+    """Экспоненциальная задержка перед очередной попыткой."""
+    return timedelta(seconds=settings.TASKS_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def execute(queued):
+    """Выполняет задачу из очереди.
+
+    Успешная задача удаляется из очереди. Упавшая возвращается в очередь
+    с экспоненциальной задержкой, пока не исчерпает TASKS_MAX_ATTEMPTS.
+    """
+    try:
+        payload = json.loads(queued.payload)
+        get_task_function(queued.name)(
+            *payload['args'], **payload['kwargs']
+        )
+    except Exception:
+        logger.exception('Задача %s #%s упала', queued.name, queued.pk)
+        attempts = queued.attempts + 1
+        failed = attempts >= settings.TASKS_MAX_ATTEMPTS
+        Task.objects.filter(pk=queued.pk).update(
+            status=Task.FAILED if failed else Task.PENDING,
+            attempts=attempts,
+            run_at=timezone.now() + retry_delay(attempts),
+            locked_by='',
+            locked_at=None,
+            last_error=traceback.format_exc(),
+        )
+        return False
+    else:
+        Task.objects.filter(pk=queued.pk).delete()
+        return True
@@ -0,0 +1,27 @@
+import time
+
+from django.template.backends.django import DjangoTemplates, Template
+
+from core.metrics import registry
+
+
+class InstrumentedTemplate(Template):
+    def render(self, context=None, request=None):
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            registry.observe(
+                'yatube_template_render_seconds',
+                (('template', self.template.name or ''),),
+                time.perf_counter() - start,
+                (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5),
+            )
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """Шаблоны Django с замером времени рендеринга для /metrics/."""
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return InstrumentedTemplate(template.template, self)
@@ -0,0 +1,54 @@
+import logging
+
+from django import template
+from django.conf import settings
+from django.utils.html import format_html
+
+from core.images import renditions
+
+register = template.Library()
+
+logger = logging.getLogger(__name__)
+
+
+def _srcset(items):
+    return ', '.join(f'{item["url"]} {item["width"]}w' for item in items)
+
+
+def _bytes(items):
+    return ' '.join(f'{item["width"]}w:{item["bytes"]}' for item in items)
+
+
+@register.simple_tag
+def responsive_image(image, css_class='', alt=''):
+    """Тег <picture> с копиями картинки разной ширины.
+
+    В data-bytes каждой копии указан её размер в байтах. Если копии
+    построить не удалось (например, файла картинки нет в хранилище),
+    ошибка пишется в лог, а тег выводит пустую строку, как {% thumbnail %}.
+    """
+    if not image:
+        return ''
+    try:
+        images = renditions(image)
+    except Exception:
+        logger.exception('Не удалось построить копии картинки %s', image.name)
+        return ''
+    sizes = settings.POST_IMAGE_SIZES
+    largest = images['fallback'][-1]
+    webp = ''
+    if images['webp']:
+        webp = format_html(
+            '<source type="image/webp" srcset="{}" sizes="{}" '
+            'data-bytes="{}">',
+            _srcset(images['webp']), sizes, _bytes(images['webp']),
+        )
+    return format_html(
+        '<picture>{}<img class="{}" src="{}" srcset="{}" sizes="{}" '
+        'width="{}" height="{}" alt="{}" loading="lazy" decoding="async" '
+        'data-bytes="{}"></picture>',
+        webp, css_class, largest['url'],
+        _srcset(images['fallback']), sizes,
+        largest['width'], largest['height'], alt,
+        _bytes(images['fallback']),
+    )
@@ -0,0 +1,81 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core import images
+from posts.models import Post
+
+User = get_user_model()
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+@override_settings(
+    DEFAULT_FILE_STORAGE='core.storage.InMemoryStorage',
+    THUMBNAIL_STORAGE='core.storage.InMemoryStorage',
+    POST_IMAGE_RENDITIONS=(320, 640),
+)
+class ResponsiveImageTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.post = Post.objects.create(
+            text='Пост с картинкой',
+            author=cls.user,
+            image=SimpleUploadedFile('small.gif', SMALL_GIF, 'image/gif'),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse(
+            'posts:post_detail', kwargs={'post_id': self.post.id}
+        )
+
+    # Проверка разметки srcset с размерами копий в байтах
+    def test_post_detail_has_srcset(self):
+        content = Client().get(self.url).content.decode()
+        self.assertIn('loading="lazy"', content)
+        self.assertIn('sizes="', content)
+        result = images.renditions(self.post.image)
+        for item in result['fallback']:
+            self.assertIn(f'{item["url"]} {item["width"]}w', content)
+            self.assertIn(f'{item["width"]}w:{item["bytes"]}', content)
+            self.assertGreater(item['bytes'], 0)
+        if images.WEBP_SUPPORTED:
+            self.assertIn('type="image/webp"', content)
+            self.assertTrue(
+                all(item['url'].endswith('.webp') for item in result['webp'])
+            )
+
+    # Проверка, что набор копий строится один раз
+    def test_renditions_cached(self):
+        images.renditions(self.post.image)
+        with mock.patch.object(images, 'get_thumbnail') as get_thumbnail:
+            Client().get(self.url)
+        get_thumbnail.assert_not_called()
+
+    # Проверка, что пост с потерянной картинкой открывается без ошибки
+    def test_missing_image(self):
+        post = Post.objects.create(
+            text='Пост без файла', author=self.user, image='posts/missing.jpg'
+        )
+        with self.assertLogs(
+            'core.templatetags.responsive_images', 'ERROR'
+        ):
+            response = Client().get(
+                reverse('posts:post_detail', kwargs={'post_id': post.id})
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, '<picture>')
@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.mail import claim, flush
+from core.models import QueuedEmail
+
+User = get_user_model()
+
+
+class CountingBackend(EmailBackend):
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return super().open()
+
+
+@override_settings(
+    EMAIL_BACKEND='core.mail.QueuedEmailBackend',
+    EMAIL_DELIVERY_BACKEND='core.tests.test_mail.CountingBackend',
+)
+class QueuedEmailTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='auth', email='auth@example.com', password='pass'
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+        CountingBackend.opened = 0
+
+    # Проверка, что письмо сброса пароля только ставится в очередь
+    def test_password_reset_mail_is_queued(self):
+        self.guest_client.post(
+            reverse('password_reset'), {'email': self.user.email}
+        )
+        self.assertEqual(QueuedEmail.objects.count(), 1)
+        self.assertEqual(len(mail.outbox), 0)
+
+        self.assertEqual(flush(batch_size=10, max_attempts=5), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [self.user.email])
+        self.assertFalse(QueuedEmail.objects.exists())
+
+    # Проверка отправки пачками через одно соединение
+    def test_flush_reuses_single_connection(self):
+        for number in range(5):
+            mail.send_mail(
+                f'Письмо {number}', 'Текст', None, ['to@example.com']
+            )
+        self.assertEqual(flush(batch_size=2, max_attempts=5), (5, 0))
+        self.assertEqual(
+            [message.subject for message in mail.outbox],
+            [f'Письмо {number}' for number in range(5)],
+        )
+        self.assertEqual(CountingBackend.opened, 1)
+
+    # Проверка, что письма, взятые другим процессом, не отправляются дважды
+    def test_claimed_mail_skipped(self):
+        for number in range(3):
+            mail.send_mail(
+                f'Письмо {number}', 'Текст', None, ['to@example.com']
+            )
+        claimed = claim(0, batch_size=2, max_attempts=5)
+        self.assertEqual(len(claimed), 2)
+        self.assertEqual(flush(batch_size=10, max_attempts=5), (1, 0))
+        self.assertEqual(
+            [message.subject for message in mail.outbox], ['Письмо 2']
+        )
+
+        # Письма упавшего отправителя возвращаются в очередь по таймауту
+        QueuedEmail.objects.update(
+            locked_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(flush(batch_size=10, max_attempts=5), (2, 0))
+        self.assertFalse(QueuedEmail.objects.exists())
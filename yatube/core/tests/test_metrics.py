@@ -0,0 +1,230 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.metrics import Registry, registry, render_prometheus
+
+User = get_user_model()
+
+
+class RegistryTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+    # Проверка, что счётчики не теряют значения при параллельной записи
+    def test_threads(self):
+        metrics = Registry()
+
+        def worker():
+            for _ in range(10000):
+                metrics.inc('yatube_requests_total', (('view', 'x'),))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(
+            metrics.snapshot()['yatube_requests_total', (('view', 'x'),)],
+            80000,
+        )
+
+    # Проверка накопительных корзин гистограммы
+    def test_histogram(self):
+        metrics = Registry()
+        for value in (0.5, 2, 7):
+            metrics.observe('h', (), value, (1, 5))
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['h_bucket', (('le', '1.0'),)], 1)
+        self.assertEqual(snapshot['h_bucket', (('le', '5.0'),)], 2)
+        self.assertEqual(snapshot['h_bucket', (('le', '+Inf'),)], 3)
+        self.assertEqual(snapshot['h_count', ()], 3)
+        self.assertEqual(snapshot['h_sum', ()], 9.5)
+
+    # Проверка сложения значений разных процессов
+    def test_collect_from_other_processes(self):
+        with override_settings(METRICS_ROOT=self.root):
+            first, second = Registry(), Registry()
+            first.inc('yatube_requests_total', (('view', 'x'),), 2)
+            second.inc('yatube_requests_total', (('view', 'x'),), 3)
+            second.flush()
+            first.flush()
+            first.inc('yatube_requests_total', (('view', 'x'),), 1)
+            values = first.collect()
+        self.assertEqual(values['yatube_requests_total', (('view', 'x'),)], 6)
+
+    # Проверка, что после fork процесс пишет свой снимок с нуля
+    def test_fork_resets_registry(self):
+        metrics = Registry()
+        metrics.inc('yatube_requests_total', (('view', 'x'),))
+        name = metrics.name
+        metrics.reset()
+        self.assertNotEqual(metrics.name, name)
+        self.assertEqual(metrics.snapshot(), {})
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.write(write, registry.name.encode())
+            os._exit(0)
+        os.close(write)
+        os.waitpid(pid, 0)
+        with os.fdopen(read) as pipe:
+            self.assertNotEqual(pipe.read(), registry.name)
+
+    # Проверка удаления снимков завершившихся процессов
+    def test_dead_snapshots_removed(self):
+        process = subprocess.Popen([sys.executable, '-c', ''])
+        process.wait()
+        dead = os.path.join(self.root, f'{process.pid}-dead.json')
+        with open(dead, 'w') as snapshot:
+            json.dump(
+                [['yatube_requests_total', [['view', 'x']], 5]], snapshot
+            )
+        with override_settings(METRICS_ROOT=self.root):
+            values = Registry().collect()
+        self.assertEqual(values['yatube_requests_total', (('view', 'x'),)], 0)
+        self.assertFalse(os.path.exists(dead))
+
+    # Проверка текстового формата Prometheus
+    def test_render(self):
+        metrics = Registry()
+        metrics.inc(
+            'yatube_requests_total',
+            (('view', 'posts:index'), ('status', '200')),
+        )
+        metrics.observe(
+            'yatube_request_duration_seconds', (('view', 'a"b'),), 0.2, (0.1,)
+        )
+        text = render_prometheus(metrics.snapshot())
+        self.assertIn('# TYPE yatube_requests_total counter', text)
+        self.assertIn(
+            'yatube_requests_total{view="posts:index",status="200"} 1', text
+        )
+        self.assertIn(
+            'yatube_request_duration_seconds_bucket{view="a\\"b",le="0.1"} 0',
+            text,
+        )
+        self.assertIn(
+            'yatube_request_duration_seconds_count{view="a\\"b"} 1', text
+        )
+
+
+@override_settings(METRICS_TOKEN='secret')
+class MetricsEndpointTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.staff = User.objects.create_user(username='staff', is_staff=True)
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        settings_override = override_settings(METRICS_ROOT=self.root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.guest_client = Client()
+        self.url = reverse('metrics')
+
+    # Проверка доступа к метрикам
+    def test_access(self):
+        self.assertEqual(self.guest_client.get(self.url).status_code, 403)
+        response = self.guest_client.get(
+            self.url, HTTP_AUTHORIZATION='Bearer wrong'
+        )
+        self.assertEqual(response.status_code, 403)
+        response = self.guest_client.get(
+            self.url, HTTP_AUTHORIZATION='Bearer secret'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        client = Client()
+        client.force_login(self.staff)
+        self.assertEqual(client.get(self.url).status_code, 200)
+
+    # Проверка метрик запросов, шаблонов и кеша
+    def test_request_metrics(self):
+        before = registry.snapshot()
+        cache.get('missing-key')
+        self.guest_client.get(reverse('posts:index'))
+        after = registry.snapshot()
+
+        def delta(name, labels):
+            return after[name, labels] - before[name, labels]
+
+        view = (('view', 'posts:index'),)
+        self.assertEqual(
+            delta('yatube_requests_total', (*view, ('status', '200'))), 1
+        )
+        self.assertEqual(
+            delta('yatube_request_duration_seconds_count', view), 1
+        )
+        self.assertGreater(
+            delta('yatube_db_queries_per_request_sum', view), 0
+        )
+        self.assertEqual(
+            delta(
+                'yatube_template_render_seconds_count',
+                (('template', 'posts/index.html'),),
+            ),
+            1,
+        )
+        self.assertGreaterEqual(
+            delta('yatube_cache_requests_total', (('result', 'miss'),)), 1
+        )
+        response = self.guest_client.get(
+            self.url, HTTP_AUTHORIZATION='Bearer secret'
+        )
+        self.assertContains(
+            response, 'yatube_requests_total{view="posts:index",status="200"}'
+        )
+
+
+@override_settings(CACHES={
+    'default': {
+        'BACKEND': 'core.cache.InstrumentedDatabaseCache',
+        'LOCATION': 'test_cache',
+    },
+})
+class DatabaseCacheMetricsTests(TestCase):
+    def setUp(self):
+        call_command('createcachetable', verbosity=0)
+
+    # Проверка учёта попаданий и промахов при пакетном чтении из базы
+    def test_get_many(self):
+        cache.set_many({'a': 1, 'b': 2})
+        before = registry.snapshot()
+        self.assertEqual(cache.get_many(['a', 'b', 'c']), {'a': 1, 'b': 2})
+        after = registry.snapshot()
+        for result, count in (('hit', 2), ('miss', 1)):
+            labels = (('result', result),)
+            self.assertEqual(
+                after['yatube_cache_requests_total', labels]
+                - before['yatube_cache_requests_total', labels],
+                count,
+            )
+
+    # Проверка, что одиночное чтение учитывается один раз
+    def test_get(self):
+        cache.set('a', 1)
+        before = registry.snapshot()
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        after = registry.snapshot()
+        for result in ('hit', 'miss'):
+            labels = (('result', result),)
+            self.assertEqual(
+                after['yatube_cache_requests_total', labels]
+                - before['yatube_cache_requests_total', labels],
+                1,
+            )
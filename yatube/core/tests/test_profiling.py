@@ -0,0 +1,77 @@
+import glob
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+User = get_user_model()
+
+
+class ProfilingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.staff = User.objects.create_user(username='staff', is_staff=True)
+        cls.user = User.objects.create_user(username='user')
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        settings_override = override_settings(PROFILING_ROOT=self.root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.staff_client = Client()
+        self.staff_client.force_login(self.staff)
+        self.user_client = Client()
+        self.user_client.force_login(self.user)
+
+    def profiles(self, view_name='*'):
+        return glob.glob(os.path.join(self.root, view_name, '*.pstats'))
+
+    # Проверка профилирования по параметру и заголовку для сотрудника
+    def test_staff_can_request_profile(self):
+        self.staff_client.get(reverse('posts:index'), {'profile': 1})
+        self.staff_client.get(
+            reverse('posts:profile', kwargs={'username': 'staff'}),
+            HTTP_X_PROFILE='1',
+        )
+        self.assertEqual(len(self.profiles('posts.index')), 1)
+        self.assertEqual(len(self.profiles('posts.profile')), 1)
+
+    # Проверка, что обычный пользователь не может включить профилирование
+    def test_user_cannot_request_profile(self):
+        self.user_client.get(reverse('posts:index'), {'profile': 1})
+        self.assertEqual(self.profiles(), [])
+
+    # Проверка профилирования по выборке
+    @override_settings(PROFILING_SAMPLE_RATE=1)
+    def test_sampling(self):
+        Client().get(reverse('posts:index'))
+        self.assertEqual(len(self.profiles('posts.index')), 1)
+
+    # Проверка профилирования потоковой страницы
+    @override_settings(STREAM_LIST_PAGES=True)
+    def test_streaming_response(self):
+        response = self.staff_client.get(
+            reverse('posts:index'), {'profile': 1}
+        )
+        self.assertEqual(self.profiles(), [])
+        b''.join(response.streaming_content)
+        self.assertEqual(len(self.profiles('posts.index')), 1)
+
+    # Проверка отчёта по сохранённым профилям
+    def test_report(self):
+        with self.assertRaises(CommandError):
+            call_command('profile_report', stdout=StringIO())
+        for _ in range(2):
+            self.staff_client.get(reverse('posts:index'), {'profile': 1})
+        out = StringIO()
+        call_command('profile_report', 'posts:index', limit=5, stdout=out)
+        self.assertIn('Профилей: 2', out.getvalue())
+        self.assertIn('cumulative', out.getvalue())
+        self.assertIn('index', out.getvalue())
@@ -0,0 +1,91 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.slow_queries import SlowQueryLogger, normalize_sql
+from posts.models import Post
+
+User = get_user_model()
+
+
+class SlowQueryLogTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        Post.objects.create(text='Пост', author=cls.user)
+
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        self.log_file = os.path.join(root, 'logs', 'slow.log')
+        settings_override = override_settings(
+            SLOW_QUERY_LOG_FILE=self.log_file,
+            SLOW_QUERY_THRESHOLD_MS=0,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.guest_client = Client()
+
+    def entries(self):
+        with open(self.log_file, encoding='utf-8') as log:
+            return [json.loads(line) for line in log]
+
+    # Проверка нормализации SQL
+    def test_normalize_sql(self):
+        self.assertEqual(
+            normalize_sql(
+                "SELECT  *\n FROM t WHERE id IN (%s, %s, %s) "
+                "AND name = 'x' AND n > 10"
+            ),
+            'SELECT * FROM t WHERE id IN (...) AND name = ? AND n > ?',
+        )
+
+    # Проверка записи запроса вместе с view и планом
+    def test_request_queries_are_logged(self):
+        self.guest_client.get(reverse('posts:index'))
+        entries = self.entries()
+        self.assertTrue(entries)
+        select = next(
+            entry for entry in entries
+            if 'FROM "posts_post"' in entry['sql']
+            and 'COUNT' not in entry['sql']
+        )
+        self.assertEqual(select['view'], 'posts:index')
+        self.assertTrue(select['plan'])
+        self.assertTrue(
+            any('SCAN' in row or 'SEARCH' in row for row in select['plan'])
+        )
+
+    # Проверка порога
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=10 ** 6)
+    def test_fast_queries_are_not_logged(self):
+        self.guest_client.get(reverse('posts:index'))
+        self.assertFalse(os.path.exists(self.log_file))
+
+    # Проверка, что план не попадает в обычный журнал запросов
+    def test_explain_bypasses_wrappers(self):
+        wrapper = SlowQueryLogger()
+        with connection.execute_wrapper(wrapper):
+            with self.assertNumQueries(1):
+                list(Post.objects.all())
+        self.assertEqual(len(self.entries()), 1)
+
+    # Проверка сводки по повторяющимся запросам
+    def test_report(self):
+        with self.assertRaises(CommandError):
+            call_command('slow_queries', stdout=StringIO())
+        for _ in range(3):
+            self.guest_client.get(reverse('posts:index'))
+        out = StringIO()
+        call_command('slow_queries', limit=3, stdout=out)
+        self.assertIn('раз: 3', out.getvalue())
+        self.assertIn('posts:index', out.getvalue())
@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from sorl.thumbnail import get_thumbnail
+
+from core.storage import InMemoryStorage
+from posts.models import Post
+
+User = get_user_model()
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+class InMemoryStorageTests(TestCase):
+    def setUp(self):
+        self.storage = InMemoryStorage(location='lru-test', max_size=10)
+        self.storage.clear()
+
+    # Проверка вытеснения давно не читанных файлов
+    def test_least_recently_used_file_evicted(self):
+        self.storage.save('a.txt', ContentFile(b'aaaa'))
+        self.storage.save('b.txt', ContentFile(b'bbbb'))
+        self.storage.open('a.txt').close()
+        self.storage.save('c.txt', ContentFile(b'cccc'))
+        self.assertTrue(self.storage.exists('a.txt'))
+        self.assertFalse(self.storage.exists('b.txt'))
+        self.assertTrue(self.storage.exists('c.txt'))
+        self.assertEqual(self.storage.store.total_size, 8)
+
+    # Проверка, что экземпляры с одним location видят одни файлы
+    def test_instances_share_files(self):
+        self.storage.save('posts/a.gif', ContentFile(SMALL_GIF))
+        other = InMemoryStorage(location='lru-test')
+        self.assertEqual(other.open('posts/a.gif').read(), SMALL_GIF)
+        self.assertEqual(other.listdir('posts'), ([], ['a.gif']))
+
+
+@override_settings(
+    DEFAULT_FILE_STORAGE='core.storage.InMemoryStorage',
+    THUMBNAIL_STORAGE='core.storage.InMemoryStorage',
+)
+class InMemoryImageTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.post = Post.objects.create(
+            text='Пост с картинкой',
+            author=cls.user,
+            image=SimpleUploadedFile('small.gif', SMALL_GIF, 'image/gif'),
+        )
+
+    # Проверка, что ImageField и sorl работают с хранилищем в памяти
+    def test_post_image_thumbnail(self):
+        self.assertIsInstance(self.post.image.storage, InMemoryStorage)
+        thumbnail = get_thumbnail(self.post.image, '960x339', crop='center')
+        self.assertTrue(thumbnail.storage.exists(thumbnail.name))
+        response = Client().get(
+            reverse('posts:post_detail', kwargs={'post_id': self.post.id})
+        )
+        self.assertContains(response, thumbnail.url)
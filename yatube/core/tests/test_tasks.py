@@ -0,0 +1,85 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from core.models import Task
+from core.tasks import claim, execute, task
+
+CALLS = []
+
+
+@task
+def remember(value):
+    CALLS.append(value)
+
+
+@task
+def explode():
+    raise ValueError('ошибка')
+
+
+@override_settings(TASKS_ALWAYS_EAGER=False)
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    # Проверка, что постановка в очередь стоит один запрос
+    def test_delay_is_single_insert(self):
+        with self.assertNumQueries(1):
+            remember.delay('значение')
+        queued = Task.objects.get()
+        self.assertEqual(queued.name, remember.task_name)
+        self.assertEqual(
+            json.loads(queued.payload),
+            {'args': ['значение'], 'kwargs': {}},
+        )
+        self.assertEqual(CALLS, [])
+
+    # Проверка выполнения задачи и удаления её из очереди
+    def test_execute_runs_and_removes_task(self):
+        remember.delay(42)
+        self.assertTrue(execute(claim(10)[0]))
+        self.assertEqual(CALLS, [42])
+        self.assertFalse(Task.objects.exists())
+
+    # Проверка повторных попыток с растущей задержкой
+    @override_settings(TASKS_MAX_ATTEMPTS=3, TASKS_RETRY_DELAY=10)
+    def test_failed_task_retried_with_backoff(self):
+        explode.delay()
+        delays = []
+        for attempt in range(3):
+            Task.objects.update(run_at=timezone.now())
+            started = timezone.now()
+            with self.assertLogs('core.tasks', level='ERROR'):
+                self.assertFalse(execute(claim(10)[0]))
+            delays.append((Task.objects.get().run_at - started).seconds)
+        queued = Task.objects.get()
+        self.assertEqual(queued.status, Task.FAILED)
+        self.assertEqual(queued.attempts, 3)
+        self.assertIn('ValueError', queued.last_error)
+        self.assertEqual(delays, [10, 20, 40])
+        self.assertEqual(claim(10), [])
+
+    # Проверка немедленного выполнения в тестовом режиме
+    @override_settings(TASKS_ALWAYS_EAGER=True)
+    def test_eager_mode_runs_inline(self):
+        remember.delay('сразу')
+        self.assertEqual(CALLS, ['сразу'])
+        self.assertFalse(Task.objects.exists())
+
+
+@override_settings(TASKS_ALWAYS_EAGER=False)
+class RunTasksCommandTests(TransactionTestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    # Проверка, что обработчик выполняет всю очередь
+    def test_worker_drains_queue(self):
+        for value in range(5):
+            remember.delay(value)
+        call_command('run_tasks', workers=2, once=True, stdout=StringIO())
+        self.assertEqual(sorted(CALLS), list(range(5)))
+        self.assertFalse(Task.objects.exists())
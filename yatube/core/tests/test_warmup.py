@@ -0,0 +1,21 @@
+import os
+import sys
+
+from django.conf import settings
+from django.test import TestCase
+
+from core.warmup import warm_up
+
+
+class WarmUpTests(TestCase):
+    # Проверка, что прогреваются все шаблоны и URL
+    def test_warm_up(self):
+        templates = sum(
+            filename.endswith('.html')
+            for _, _, files in os.walk(settings.TEMPLATES_DIR)
+            for filename in files
+        )
+        result = warm_up()
+        self.assertEqual(result['templates'], templates)
+        self.assertGreater(result['urls'], 0)
+        self.assertIn('sorl.thumbnail.base', sys.modules)
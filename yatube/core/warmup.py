@@ -0,0 +1,91 @@
+import logging
+import os
+import time
+from importlib import import_module
+
+from django.db import DatabaseError, connections
+from django.template import engines
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+HOT_MODULES = (
+    'PIL.Image',
+    'sorl.thumbnail.base',
+    'sorl.thumbnail.engines.pil_engine',
+    'sorl.thumbnail.kvstores.cached_db_kvstore',
+    'django.contrib.admin.views.main',
+    'django.core.paginator',
+    'core.images',
+    'core.streaming',
+    'posts.views',
+)
+
+
+def template_names(engine):
+    """Имена всех .html шаблонов из каталогов DIRS движка."""
+    for directory in engine.engine.dirs:
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith('.html'):
+                    yield os.path.relpath(
+                        os.path.join(root, filename), directory
+                    ).replace(os.sep, '/')
+
+
+def compile_templates():
+    """Загружает шаблоны в кеш загрузчика (cached.Loader при DEBUG=False)."""
+    compiled = 0
+    for engine in engines.all():
+        for name in template_names(engine):
+            engine.get_template(name)
+            compiled += 1
+    return compiled
+
+
+def prime_resolver():
+    resolver = get_resolver()
+    resolver.reverse_dict
+    return len(resolver.reverse_dict)
+
+
+def import_hot_modules():
+    for name in HOT_MODULES:
+        import_module(name)
+    from sorl.thumbnail import default
+    default.engine, default.kvstore, default.backend
+    return len(HOT_MODULES)
+
+
+def prime_caches():
+    """Строит гистограмму месяцев, если её нет в кеше."""
+    from posts.months import month_histogram
+    try:
+        month_histogram()
+    except DatabaseError:
+        logger.warning('Прогрев кеша пропущен: база недоступна')
+        return False
+    finally:
+        # Соединение не должно достаться процессам после fork
+        connections.close_all()
+    return True
+
+
+def warm_up():
+    """Прогрев процесса перед приёмом запросов.
+
+    Вызывается из wsgi.py при WARMUP_ON_START, до fork рабочих процессов
+    (например, gunicorn --preload): шаблоны, URL-резолвер и модули,
+    которые иначе загружаются при первом запросе, оказываются в памяти
+    мастер-процесса и достаются рабочим готовыми.
+    """
+    start = time.perf_counter()
+    result = {
+        'templates': compile_templates(),
+        'urls': prime_resolver(),
+        'modules': import_hot_modules(),
+        'caches': prime_caches(),
+    }
+    result['seconds'] = time.perf_counter() - start
+    logger.info('Прогрев завершён: %s', result)
+    return result
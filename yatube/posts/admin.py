@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from posts.models import Group, Post
+from posts.models import ArchivedPost, Comment, Group, Post
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -28,5 +28,35 @@ class GroupAdmin(admin.ModelAdmin):
     empty_value_display = "-пусто-"
 
 
+class ArchivedPostAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'text',
+        'pub_date',
+        'author',
+        'group',
+        'archived_at',
+    )
+    search_fields = ('text',)
+    list_filter = ('pub_date',)
+    empty_value_display = '-пусто-'
+
+
+class CommentAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'text',
+        'created',
+        'author',
+        'post',
+    )
+    search_fields = ('text',)
+    list_filter = ('created',)
+    raw_id_fields = ('post', 'parent')
+    empty_value_display = '-пусто-'
+
+
 admin.site.register(Post, PostAdmin)
 admin.site.register(Group, GroupAdmin)
+admin.site.register(ArchivedPost, ArchivedPostAdmin)
+admin.site.register(Comment, CommentAdmin)
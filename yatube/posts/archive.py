@@ -0,0 +1,98 @@
+from django.db import transaction
+from django.db.models import Min
+from django.utils.functional import SimpleLazyObject, cached_property
+
+from posts.models import ArchivedPost, Comment, FeedEntry, Post
+
+
+def archived_fields():
+    """Поля, которые переносятся из Post в ArchivedPost."""
+    archive_fields = {
+        field.attname for field in ArchivedPost._meta.concrete_fields
+    }
+    return [
+        field.attname for field in Post._meta.concrete_fields
+        if field.attname in archive_fields
+    ]
+
+
+def move_to_archive(cutoff, batch_size):
+    """Переносит посты старше cutoff в архив пачками по batch_size.
+
+    Каждая пачка переносится в отдельной транзакции, поэтому прерванный
+    перенос можно просто запустить заново. Посты с комментариями остаются
+    в основной таблице, а вместе с ними и все посты новее самого старого
+    из них: иначе архив перестал бы продолжать основную таблицу
+    (см. TieredPosts). Возвращает число перенесённых постов.
+    """
+    fields = archived_fields()
+    commented = Comment.objects.aggregate(oldest=Min('post__pub_date'))
+    if commented['oldest'] is not None:
+        cutoff = min(cutoff, commented['oldest'])
+    candidates = Post.objects.filter(pub_date__lt=cutoff).order_by('pk')
+    moved = 0
+    while True:
+        with transaction.atomic():
+            rows = list(candidates.values(*fields)[:batch_size])
+            if not rows:
+                return moved
+            ArchivedPost.objects.bulk_create(
+                ArchivedPost(**row) for row in rows
+            )
+            # Для посетителей пост остаётся на месте, поэтому удаление идёт
+            # без сигналов post_delete: счётчики групп, гистограммы месяцев
+            # и кеш страниц не меняются
+            ids = [row['id'] for row in rows]
+            FeedEntry.objects.filter(post_id__in=ids)._raw_delete(
+                FeedEntry.objects.db
+            )
+            Post.objects.filter(pk__in=ids)._raw_delete(Post.objects.db)
+        moved += len(rows)
+
+
+class TieredPosts:
+    """Посты из основной таблицы, за которыми следуют архивные.
+
+    Архив содержит только посты старше любого поста в основной таблице,
+    поэтому при сортировке по -pub_date архив просто продолжает основную
+    выборку. Запрос к архиву выполняется, только когда срез выходит за
+    пределы основной таблицы. Срез вычисляется при первом обращении к
+    нему. Подходит для передачи в Paginator.
+    """
+
+    def __init__(self, hot, archive):
+        self.hot = hot
+        self.archive = archive
+
+    @cached_property
+    def hot_count(self):
+        return self.hot.count()
+
+    @cached_property
+    def archive_count(self):
+        return self.archive.count()
+
+    def count(self):
+        return self.hot_count + self.archive_count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        return SimpleLazyObject(
+            lambda: self._slice(key.start or 0, key.stop)
+        )
+
+    def _slice(self, start, stop):
+        stop = self.count() if stop is None else stop
+        hot_count = self.hot_count
+        posts = []
+        if start < hot_count:
+            posts.extend(self.hot[start:min(stop, hot_count)])
+        if stop > hot_count:
+            posts.extend(
+                self.archive[max(start - hot_count, 0):stop - hot_count]
+            )
+        return posts
@@ -0,0 +1,54 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+CARD_TEMPLATE = 'includes/article.html'
+
+
+def card_key(post, show_link):
+    """Ключ карточки поста: id, время изменения и всё, что не меняет его.
+
+    Счётчик комментариев обновляется через queryset.update() и не трогает
+    Post.updated, имя автора и адрес группы хранятся в других таблицах,
+    поэтому они тоже входят в ключ.
+    """
+    extra = '{}:{}:{}:{}'.format(
+        getattr(post, 'comments_count', 0),
+        int(bool(show_link)),
+        post.author.get_full_name(),
+        post.group.slug if post.group_id else '',
+    )
+    return 'post_card:{}:{}:{}'.format(
+        post.pk,
+        post.updated.timestamp(),
+        hashlib.md5(extra.encode()).hexdigest(),
+    )
+
+
+def attach_cards(posts, show_link):
+    """Добавляет постам страницы атрибут card с готовой разметкой.
+
+    Карточки одного поста на главной, в группе, в профиле и в архиве
+    совпадают, поэтому хранятся в общем кеше. Все карточки страницы
+    читаются одним get_many, отрисовываются только отсутствующие. Карточки
+    с картинкой, для которой ещё нет миниатюры, в кеш не кладутся.
+    """
+    if not settings.POST_CARD_CACHE_TIMEOUT:
+        return
+    keys = {card_key(post, show_link): post for post in posts}
+    found = cache.get_many(list(keys))
+    template = get_template(CARD_TEMPLATE)
+    rendered = {}
+    for key, post in keys.items():
+        if key in found:
+            post.card = mark_safe(found[key])
+            continue
+        card = template.render({'post': post, 'show_link': show_link})
+        post.card = mark_safe(card)
+        if not post.image or getattr(post, 'list_thumbnail', None):
+            rendered[key] = card
+    if rendered:
+        cache.set_many(rendered, settings.POST_CARD_CACHE_TIMEOUT)
@@ -0,0 +1,86 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, When
+
+from posts.models import Post
+
+logger = logging.getLogger(__name__)
+
+
+def write_views(pending):
+    """Прибавляет просмотры к постам: UPDATE ... CASE на пачку постов."""
+    post_ids = sorted(pending)
+    batch_size = settings.POST_VIEWS_FLUSH_BATCH_SIZE
+    with transaction.atomic():
+        for start in range(0, len(post_ids), batch_size):
+            batch = post_ids[start:start + batch_size]
+            Post.objects.filter(pk__in=batch).update(
+                views=Case(
+                    *(
+                        When(pk=post_id, then=F('views') + pending[post_id])
+                        for post_id in batch
+                    ),
+                    default=F('views'),
+                )
+            )
+
+
+class ViewCounter:
+    """Счётчик просмотров постов с отложенной записью.
+
+    Просмотры копятся в памяти процесса и раз в POST_VIEWS_FLUSH_INTERVAL
+    секунд записываются в базу одной транзакцией. Если запись не удалась,
+    просмотры возвращаются в буфер и уйдут со следующим сбросом. При
+    аварийном завершении процесса теряются только просмотры за последний
+    интервал.
+    """
+
+    def __init__(self):
+        self.pending = Counter()
+        self.lock = threading.Lock()
+        self.last_flush = time.monotonic()
+
+    def record(self, post_id):
+        interval = settings.POST_VIEWS_FLUSH_INTERVAL
+        with self.lock:
+            self.pending[post_id] += 1
+            now = time.monotonic()
+            due = interval is not None and now - self.last_flush >= interval
+            if due:
+                self.last_flush = now
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Записывает накопленные просмотры, возвращает число постов."""
+        with self.lock:
+            pending, self.pending = self.pending, Counter()
+        if not pending:
+            return 0
+        try:
+            write_views(pending)
+        except Exception:
+            logger.exception('Не удалось записать просмотры постов')
+            with self.lock:
+                self.pending.update(pending)
+            return 0
+        return len(pending)
+
+    def clear(self):
+        with self.lock:
+            self.pending.clear()
+
+
+post_views = ViewCounter()
+
+
+@atexit.register
+def flush_on_exit():
+    if settings.POST_VIEWS_FLUSH_INTERVAL is not None:
+        post_views.flush()
@@ -0,0 +1,130 @@
+from heapq import merge
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.functional import SimpleLazyObject, cached_property
+
+from posts.models import FeedEntry, Follow, Post
+
+
+def is_high_fanout(author_id):
+    """Слишком много подписчиков, чтобы раскладывать посты по лентам."""
+    return Follow.objects.filter(
+        author_id=author_id
+    ).count() >= settings.FEED_FANOUT_THRESHOLD
+
+
+def switch_to_fanout_on_read(author_id):
+    """Переводит всех подписчиков автора на чтение его постов напрямую."""
+    with transaction.atomic():
+        Follow.objects.filter(author_id=author_id).update(fanout_on_read=True)
+        FeedEntry.objects.filter(post__author_id=author_id).delete()
+
+
+def fill_inbox(user_ids, posts):
+    FeedEntry.objects.bulk_create(
+        (
+            FeedEntry(user_id=user_id, post_id=post_id, pub_date=pub_date)
+            for user_id in user_ids
+            for post_id, pub_date in posts
+        ),
+        batch_size=settings.FEED_FANOUT_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def follow(user, author):
+    """Подписывает user на author и добавляет в ленту его последние посты."""
+    if user == author:
+        return
+    high_fanout = is_high_fanout(author.pk)
+    _, created = Follow.objects.get_or_create(
+        user=user, author=author,
+        defaults={'fanout_on_read': high_fanout},
+    )
+    if not created:
+        return
+    if high_fanout:
+        if Follow.objects.filter(
+            author=author, fanout_on_read=False
+        ).exists():
+            switch_to_fanout_on_read(author.pk)
+        return
+    fill_inbox(
+        [user.pk],
+        author.posts.values_list('pk', 'pub_date')[
+            :settings.FEED_BACKFILL_POSTS
+        ],
+    )
+
+
+def unfollow(user, author):
+    Follow.objects.filter(user=user, author=author).delete()
+    FeedEntry.objects.filter(user=user, post__author=author).delete()
+
+
+def fan_out(post):
+    """Раскладывает новый пост по лентам подписчиков автора.
+
+    Для авторов с FEED_FANOUT_THRESHOLD подписчиков и больше посты по
+    лентам не раскладываются: FollowFeed читает их при показе ленты.
+    """
+    if is_high_fanout(post.author_id):
+        if Follow.objects.filter(
+            author_id=post.author_id, fanout_on_read=False
+        ).exists():
+            switch_to_fanout_on_read(post.author_id)
+        return
+    fill_inbox(
+        Follow.objects.filter(author_id=post.author_id)
+        .values_list('user_id', flat=True).iterator(),
+        [(post.pk, post.pub_date)],
+    )
+
+
+class FollowFeed:
+    """Лента подписок для Paginator.
+
+    Объединяет посты из личной ленты пользователя (fan-out при записи) с
+    постами авторов, читаемых напрямую (fan-out при чтении). Обе выборки
+    отсортированы по дате и идут по индексам, поэтому для страницы нужно
+    прочитать не больше stop записей из каждой. Срез вычисляется при
+    первом обращении к нему.
+    """
+
+    def __init__(self, user):
+        self.inbox = Post.objects.filter(
+            feed_entries__user=user
+        ).select_related('author', 'group').defer('text').order_by(
+            '-feed_entries__pub_date'
+        )
+        self.direct = Post.objects.filter(
+            author__in=Follow.objects.filter(
+                user=user, fanout_on_read=True
+            ).values('author')
+        ).select_related('author', 'group').defer('text')
+
+    @cached_property
+    def _count(self):
+        return self.inbox.count() + self.direct.count()
+
+    def count(self):
+        return self._count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        return SimpleLazyObject(
+            lambda: self._slice(key.start or 0, key.stop)
+        )
+
+    def _slice(self, start, stop):
+        stop = self._count if stop is None else stop
+        posts = merge(
+            self.inbox[:stop], self.direct[:stop],
+            key=lambda post: post.pub_date, reverse=True,
+        )
+        return list(posts)[start:stop]
@@ -1,6 +1,6 @@
-from posts.models import Post
+from posts.models import Comment, Post
 
-from django.forms import ModelForm
+from django.forms import HiddenInput, IntegerField, ModelForm
 
 
 class PostForm(ModelForm):
@@ -18,3 +18,15 @@ class PostForm(ModelForm):
             'text': 'обязательное поле',
             'group': 'Выберите группу',
         }
+
+
+class CommentForm(ModelForm):
+    # id комментария верхнего уровня, на который пишется ответ
+    parent = IntegerField(required=False, widget=HiddenInput)
+
+    class Meta:
+        model = Comment
+        fields = ('text',)
+        labels = {
+            'text': 'Комментарий',
+        }
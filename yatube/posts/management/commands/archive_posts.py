@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from posts.archive import move_to_archive
+
+
+class Command(BaseCommand):
+    help = 'Переносит старые посты в архивную таблицу.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.POSTS_ARCHIVE_AFTER_DAYS,
+            help='Переносить посты старше указанного числа дней.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.POSTS_ARCHIVE_BATCH_SIZE,
+            help='Сколько постов переносить в одной транзакции.',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        moved = move_to_archive(cutoff, options['batch_size'])
+        self.stdout.write(f'Перенесено в архив: {moved}')
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from posts.sitemaps import build_sitemaps
+
+
+class Command(BaseCommand):
+    help = 'Обновляет карту сайта, перестраивая только изменённые чанки.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Перестроить все чанки постов.',
+        )
+
+    def handle(self, *args, **options):
+        built = build_sitemaps(full=options['full'])
+        self.stdout.write(f'Перестроено файлов: {len(built)}')
@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from sorl.thumbnail import default
+from sorl.thumbnail.conf import settings as sorl_settings
+
+from posts.media import (
+    batches, delete_files, delete_images, find_orphans, prune_kvstore,
+    referenced_images, referenced_thumbnails
+)
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет картинки, на которые не ссылается ни один пост, '
+        'и миниатюры, которых нет в хранилище sorl-thumbnail.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать, сколько файлов будет удалено.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.MEDIA_GC_BATCH_SIZE,
+            help='Сколько файлов удалять за один проход.',
+        )
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=settings.MEDIA_GC_MIN_AGE,
+            help='Не трогать файлы моложе указанного числа секунд.',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        storage = Post._meta.get_field('image').storage
+        upload_to = Post._meta.get_field('image').upload_to
+        images = self.collect(
+            find_orphans(
+                storage, upload_to.rstrip('/'), referenced_images(),
+                options['min_age'],
+            ),
+            options['batch_size'],
+            lambda batch: delete_images(batch, storage, dry_run),
+        )
+        entries = prune_kvstore(referenced_images(), dry_run)
+        thumbnails = self.collect(
+            find_orphans(
+                default.storage,
+                sorl_settings.THUMBNAIL_PREFIX.rstrip('/'),
+                referenced_thumbnails(),
+                options['min_age'],
+            ),
+            options['batch_size'],
+            lambda batch: delete_files(batch, default.storage, dry_run),
+        )
+        verb = 'К удалению' if dry_run else 'Удалено'
+        self.stdout.write(
+            f'{verb}: картинок {images[0]} ({images[1]} байт), '
+            f'миниатюр без записи {thumbnails[0]} ({thumbnails[1]} байт), '
+            f'записей sorl-thumbnail {entries}'
+        )
+
+    def collect(self, orphans, batch_size, delete):
+        files = size = 0
+        for batch in batches(orphans, batch_size):
+            deleted, deleted_size = delete(batch)
+            files += deleted
+            size += deleted_size
+        return files, size
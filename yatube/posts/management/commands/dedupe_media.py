@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+from sorl.thumbnail import delete as delete_thumbnails
+
+from core.storage import (
+    ContentAddressedStorage, content_name, file_digest, is_content_name
+)
+from posts.models import ArchivedPost, Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Переводит картинки постов на имена по хешу содержимого, '
+        'оставляя по одной копии каждой картинки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать, сколько файлов будет объединено.',
+        )
+
+    def handle(self, *args, **options):
+        storage = Post._meta.get_field('image').storage
+        if not isinstance(storage, ContentAddressedStorage):
+            raise CommandError(
+                'Картинки постов хранятся не в ContentAddressedStorage.'
+            )
+        renamed = {}
+        for model in (Post, ArchivedPost):
+            images = (
+                model.objects.exclude(image='')
+                .values_list('pk', 'image').order_by('pk').iterator()
+            )
+            for pk, name in images:
+                if is_content_name(name) or not storage.exists(name):
+                    continue
+                if name not in renamed:
+                    with storage.open(name) as content:
+                        if options['dry_run']:
+                            new_name = content_name(
+                                name, file_digest(content)
+                            )
+                        else:
+                            new_name = storage.save(name, content)
+                    renamed[name] = new_name
+                if not options['dry_run']:
+                    model.objects.filter(pk=pk).update(image=renamed[name])
+        if not options['dry_run']:
+            for name in renamed:
+                delete_thumbnails(
+                    Post(image=name).image, delete_file=False
+                )
+                storage.delete(name)
+        self.stdout.write(
+            f'Файлов переименовано: {len(renamed)}, '
+            f'уникальных: {len(set(renamed.values()))}'
+        )
@@ -0,0 +1,29 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts.trending import refresh_trending
+
+
+class Command(BaseCommand):
+    help = 'Обновляет рейтинг популярных постов и групп на главной.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а обновлять рейтинг каждые '
+                 'TRENDING_REFRESH_INTERVAL секунд.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            trending = refresh_trending()
+            self.stdout.write(
+                f'Постов в рейтинге: {len(trending["posts"])}, '
+                f'групп: {len(trending["groups"])}'
+            )
+            if not options['loop']:
+                return
+            time.sleep(settings.TRENDING_REFRESH_INTERVAL)
@@ -0,0 +1,162 @@
+import os
+import posixpath
+import time
+
+from django.core.cache import cache
+from sorl.thumbnail import default
+from sorl.thumbnail.conf import settings as sorl_settings
+
+from core.images import renditions_key
+from posts.models import ArchivedPost, Post
+
+
+def referenced_images():
+    """Имена картинок, на которые ссылаются посты и архивные посты."""
+    names = set()
+    for model in (Post, ArchivedPost):
+        names.update(
+            model.objects.exclude(image='')
+            .values_list('image', flat=True).iterator()
+        )
+    return names
+
+
+def walk_storage(storage, directory):
+    """Обходит каталог хранилища, выдавая (имя, размер, время изменения).
+
+    У файловых хранилищ каталог читается через os.scandir без построения
+    полного списка файлов, у остальных — через storage.listdir().
+    Временные файлы незаконченных загрузок (с точкой в начале имени)
+    пропускаются.
+    """
+    try:
+        root = storage.path(directory)
+    except NotImplementedError:
+        yield from walk_listdir(storage, directory)
+        return
+    stack = [(root, directory)]
+    while stack:
+        path, name = stack.pop()
+        try:
+            entries = os.scandir(path)
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                entry_name = posixpath.join(name, entry.name)
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, entry_name))
+                elif entry.is_file(follow_symlinks=False):
+                    stat = entry.stat()
+                    yield entry_name, stat.st_size, stat.st_mtime
+
+
+def walk_listdir(storage, directory):
+    directories, files = storage.listdir(directory)
+    for filename in files:
+        if filename.startswith('.'):
+            continue
+        name = posixpath.join(directory, filename)
+        yield (
+            name,
+            storage.size(name),
+            storage.get_modified_time(name).timestamp(),
+        )
+    for subdirectory in directories:
+        yield from walk_listdir(
+            storage, posixpath.join(directory, subdirectory)
+        )
+
+
+def find_orphans(storage, directory, referenced, min_age):
+    """Файлы каталога, которых нет в referenced и которые старше min_age.
+
+    Свежие файлы пропускаются: картинка сохраняется в хранилище раньше,
+    чем пост, который на неё ссылается.
+    """
+    cutoff = time.time() - min_age
+    for name, size, modified in walk_storage(storage, directory):
+        if name not in referenced and modified < cutoff:
+            yield name, size
+
+
+def batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def delete_images(batch, storage, dry_run):
+    """Удаляет пачку неиспользуемых картинок вместе с их миниатюрами.
+
+    Перед удалением ссылки проверяются ещё раз: за время обхода картинка
+    могла достаться новому посту. Набор копий для srcset тоже забывается:
+    иначе повторная загрузка тех же байт получила бы то же имя и ссылки на
+    удалённые миниатюры. Возвращает (файлов, байт).
+    """
+    names = {name for name, _ in batch}
+    for model in (Post, ArchivedPost):
+        names -= set(
+            model.objects.filter(image__in=names)
+            .values_list('image', flat=True)
+        )
+    batch = [(name, size) for name, size in batch if name in names]
+    if not dry_run:
+        for name, _ in batch:
+            default.backend.delete(
+                Post(image=name).image, delete_file=False
+            )
+            cache.delete(renditions_key(name))
+            storage.delete(name)
+    return len(batch), sum(size for _, size in batch)
+
+
+def delete_files(batch, storage, dry_run):
+    """Удаляет пачку файлов. Возвращает (файлов, байт)."""
+    if not dry_run:
+        for name, _ in batch:
+            storage.delete(name)
+    return len(batch), sum(size for _, size in batch)
+
+
+def image_entries(kvstore):
+    """Записи о картинках в key-value хранилище sorl."""
+    for key in kvstore._find_keys(identity='image'):
+        image_file = kvstore._get(key)
+        if image_file is not None:
+            yield image_file
+
+
+def prune_kvstore(referenced, dry_run):
+    """Удаляет из хранилища sorl картинки постов, на которые нет ссылок.
+
+    Вместе с записью удаляются миниатюры картинки и их файлы. Возвращает
+    число удалённых записей.
+    """
+    kvstore = default.kvstore
+    upload_to = Post._meta.get_field('image').upload_to
+    stale = [
+        image_file for image_file in image_entries(kvstore)
+        if image_file.name.startswith(upload_to)
+        and image_file.name not in referenced
+    ]
+    if not dry_run:
+        for image_file in stale:
+            kvstore.delete(image_file)
+    return len(stale)
+
+
+def referenced_thumbnails():
+    """Имена файлов миниатюр, известных хранилищу sorl."""
+    prefix = sorl_settings.THUMBNAIL_PREFIX
+    return {
+        image_file.name for image_file in image_entries(default.kvstore)
+        if image_file.name.startswith(prefix)
+    }
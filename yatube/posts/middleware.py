@@ -0,0 +1,134 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.http import HttpResponse
+from django.urls import Resolver404, resolve
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from posts.counters import post_views
+
+PAGE_CACHE_VERSION_KEY = 'page_cache:version'
+CACHED_VIEWS = (
+    'posts:index',
+    'posts:group_list',
+    'posts:profile',
+    'posts:post_detail',
+)
+# С этими cookie ответ зависит от пользователя: сессия или сообщения
+PERSONAL_COOKIES = (settings.SESSION_COOKIE_NAME, 'messages')
+
+
+def post_page_version_key(post_id):
+    return f'page_cache:post:{post_id}'
+
+
+def bump_version(store, key):
+    """Записывает новую случайную версию.
+
+    В отличие от incr(), это безопасно при записи из нескольких
+    процессов: любая новая версия отличается от всех прежних.
+    """
+    store.set(key, uuid.uuid4().hex[:12], None)
+
+
+def get_version(store, key):
+    version = store.get(key)
+    if version is None:
+        store.add(key, uuid.uuid4().hex[:12], None)
+        version = store.get(key, '')
+    return version
+
+
+def invalidate_pages():
+    """Делает недействительными все страницы в кеше сменой версии."""
+    bump_version(caches['state'], PAGE_CACHE_VERSION_KEY)
+
+
+def invalidate_post_page(post_id):
+    """Делает недействительной только страницу поста."""
+    bump_version(cache, post_page_version_key(post_id))
+
+
+def page_cache_version():
+    return get_version(caches['state'], PAGE_CACHE_VERSION_KEY)
+
+
+class AnonymousPageCacheMiddleware:
+    """Кеш целых страниц для анонимных посетителей.
+
+    Стоит перед SessionMiddleware и CsrfViewMiddleware: страница из кеша
+    отдаётся без загрузки сессии, проверки CSRF и рендеринга. Кешируются
+    только GET-запросы без cookie сессии к CACHED_VIEWS, ключ — путь и
+    номер страницы. Запись поста или группы меняет версию кеша, и все
+    страницы строятся заново. Комментарий сбрасывает только страницу
+    своего поста: у неё есть ещё и собственная версия.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        match = self.cacheable_match(request)
+        if match is None:
+            return self.get_response(request)
+        key = self.cache_key(request, match)
+        response = cache.get(key)
+        if response is not None:
+            if match.view_name == 'posts:post_detail':
+                post_views.record(match.kwargs['post_id'])
+            return response
+        response = self.get_response(request)
+        if response.status_code == 200 and not response.cookies:
+            patch_cache_control(
+                response, public=True, max_age=settings.PAGE_CACHE_MAX_AGE
+            )
+            patch_vary_headers(response, ('Cookie',))
+            if response.streaming:
+                response.streaming_content = self.store_streamed(
+                    response, response.streaming_content, key
+                )
+            else:
+                cache.set(key, response, settings.PAGE_CACHE_TIMEOUT)
+        return response
+
+    def store_streamed(self, response, content, key):
+        """Отдаёт части ответа и кладёт в кеш страницу целиком."""
+        chunks = []
+        for chunk in content:
+            chunks.append(chunk)
+            yield chunk
+        cached = HttpResponse(b''.join(chunks), status=response.status_code)
+        for header, value in response.items():
+            cached[header] = value
+        cache.set(key, cached, settings.PAGE_CACHE_TIMEOUT)
+
+    def cacheable_match(self, request):
+        if (
+            not settings.PAGE_CACHE_TIMEOUT
+            or request.method not in ('GET', 'HEAD')
+            or any(name in request.COOKIES for name in PERSONAL_COOKIES)
+            or set(request.GET) - {'page'}
+        ):
+            return None
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+        if match.view_name not in CACHED_VIEWS:
+            return None
+        return match
+
+    def cache_key(self, request, match):
+        url = f'{request.get_host()}{request.path}'
+        version = page_cache_version()
+        if match.view_name == 'posts:post_detail':
+            version = '{}.{}'.format(version, get_version(
+                cache, post_page_version_key(match.kwargs['post_id'])
+            ))
+        return 'page:{}:{}:{}'.format(
+            version,
+            hashlib.md5(url.encode()).hexdigest(),
+            request.GET.get('page', ''),
+        )
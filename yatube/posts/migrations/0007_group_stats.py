@@ -0,0 +1,56 @@
+# Generated by Django 2.2.16 on 2026-10-19 07:41
+
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_group_stats(apps, schema_editor):
+    Group = apps.get_model('posts', 'Group')
+    Post = apps.get_model('posts', 'Post')
+    ArchivedPost = apps.get_model('posts', 'ArchivedPost')
+
+    def aggregate(model, value, output_field):
+        return Subquery(
+            model.objects.filter(group=OuterRef('pk')).order_by()
+            .values('group').annotate(value=value).values('value'),
+            output_field=output_field,
+        )
+
+    groups = Group.objects.annotate(
+        hot_count=Coalesce(
+            aggregate(Post, Count('pk'), models.IntegerField()), 0
+        ),
+        archive_count=Coalesce(
+            aggregate(ArchivedPost, Count('pk'), models.IntegerField()), 0
+        ),
+        hot_last=aggregate(Post, Max('pub_date'), models.DateTimeField()),
+        archive_last=aggregate(
+            ArchivedPost, Max('pub_date'), models.DateTimeField()
+        ),
+    )
+    for group in groups:
+        group.posts_count = group.hot_count + group.archive_count
+        group.last_post_date = group.hot_last or group.archive_last
+        group.save(update_fields=('posts_count', 'last_post_date'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0006_archivedpost'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='last_post_date',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Дата последнего поста'),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='posts_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False, verbose_name='Количество постов'),
+        ),
+        migrations.RunPython(fill_group_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:10
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+BATCH_SIZE = 500
+
+
+def backfill_excerpt(apps, schema_editor):
+    for name in ('Post', 'ArchivedPost'):
+        model = apps.get_model('posts', name)
+        batch = []
+        for post in model.objects.only('pk', 'text').iterator():
+            post.excerpt = Truncator(post.text).chars(300)
+            batch.append(post)
+            if len(batch) == BATCH_SIZE:
+                model.objects.bulk_update(batch, ['excerpt'])
+                batch = []
+        model.objects.bulk_update(batch, ['excerpt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0012_post_updated'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedpost',
+            name='excerpt',
+            field=models.CharField(blank=True, max_length=300, verbose_name='Начало текста'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=300, verbose_name='Начало текста'),
+        ),
+        migrations.RunPython(backfill_excerpt, migrations.RunPython.noop),
+    ]
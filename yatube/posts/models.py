@@ -1,8 +1,16 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils.text import Truncator
 
 User = get_user_model()
 
+EXCERPT_LENGTH = 300
+
+
+def make_excerpt(text):
+    """Начало текста поста для списков."""
+    return Truncator(text).chars(EXCERPT_LENGTH)
+
 
 class Group(models.Model):
     title = models.CharField(
@@ -19,6 +27,19 @@ class Group(models.Model):
         verbose_name='Описание',
         help_text='Введите описание группы'
     )
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        db_index=True,
+        editable=False,
+        verbose_name='Количество постов'
+    )
+    last_post_date = models.DateTimeField(
+        blank=True,
+        null=True,
+        db_index=True,
+        editable=False,
+        verbose_name='Дата последнего поста'
+    )
 
     def __str__(self) -> str:
         return self.title
@@ -29,13 +50,21 @@ class Post(models.Model):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self._initial_group_id = self.__dict__.get('group_id')
 
     text = models.TextField(
         verbose_name='Текст Поста',
         help_text='Введите текст Поста'
     )
+    excerpt = models.CharField(
+        max_length=EXCERPT_LENGTH,
+        blank=True,
+        editable=False,
+        verbose_name='Начало текста'
+    )
     pub_date = models.DateTimeField(
         auto_now_add=True,
+        db_index=True,
         verbose_name='Дата Публикации',
         help_text='Покаазывает дату публикации'
     )
@@ -60,9 +89,209 @@ class Post(models.Model):
         upload_to='posts/',
         blank=True
     )
+    comments_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
+    views = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Просмотры'
+    )
+    updated = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения'
+    )
+
+    is_archived = False
 
     def __str__(self):
         return self.text[self.SYMBOLS_IN_STR]
 
+    def save(self, *args, **kwargs):
+        # Списки загружают пост без текста (defer), тогда текст не менялся
+        update_fields = kwargs.get('update_fields')
+        if 'text' not in self.get_deferred_fields() and (
+            update_fields is None or 'text' in update_fields
+        ):
+            self.excerpt = make_excerpt(self.text)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'excerpt'}
+        super().save(*args, **kwargs)
+
+    class Meta:
+        ordering = ('-pub_date',)
+        indexes = (
+            models.Index(fields=('author', '-pub_date')),
+            models.Index(fields=('group', '-pub_date')),
+        )
+
+
+class ArchivedPost(models.Model):
+    """Пост, перенесённый из Post командой archive_posts.
+
+    id совпадает с id исходного поста, поэтому адреса страниц не меняются.
+    """
+    is_archived = True
+
+    id = models.IntegerField(primary_key=True)
+    text = models.TextField(verbose_name='Текст Поста')
+    excerpt = models.CharField(
+        max_length=EXCERPT_LENGTH,
+        blank=True,
+        verbose_name='Начало текста'
+    )
+    pub_date = models.DateTimeField(
+        db_index=True,
+        verbose_name='Дата Публикации'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_posts',
+        verbose_name='Автор'
+    )
+    group = models.ForeignKey(
+        Group,
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name='archived_posts',
+        verbose_name='Группа'
+    )
+    image = models.ImageField(
+        'Картинка',
+        upload_to='posts/',
+        blank=True
+    )
+    views = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Просмотры'
+    )
+    updated = models.DateTimeField(
+        verbose_name='Дата изменения'
+    )
+    archived_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата переноса в архив'
+    )
+
+    def __str__(self):
+        return self.text[:Post.SYMBOLS_IN_STR]
+
+    class Meta:
+        ordering = ('-pub_date',)
+        verbose_name = 'Архивный пост'
+        verbose_name_plural = 'Архивные посты'
+
+
+class Comment(models.Model):
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='comments',
+        verbose_name='Пост'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='comments',
+        verbose_name='Автор'
+    )
+    parent = models.ForeignKey(
+        'self',
+        blank=True,
+        null=True,
+        on_delete=models.CASCADE,
+        related_name='replies',
+        verbose_name='Ответ на комментарий'
+    )
+    text = models.TextField(
+        verbose_name='Текст комментария',
+        help_text='Введите текст комментария'
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата комментария'
+    )
+
+    def __str__(self):
+        return self.text[:Post.SYMBOLS_IN_STR]
+
+    class Meta:
+        ordering = ('created',)
+        indexes = (
+            models.Index(fields=('post', 'parent', 'created')),
+        )
+        verbose_name = 'Комментарий'
+        verbose_name_plural = 'Комментарии'
+
+
+class Follow(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='follower',
+        verbose_name='Подписчик'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='following',
+        verbose_name='Автор'
+    )
+    fanout_on_read = models.BooleanField(
+        default=False,
+        verbose_name='Читать посты автора напрямую',
+        help_text='Посты авторов с большим числом подписчиков не '
+                  'раскладываются по лентам, а читаются при показе ленты'
+    )
+
+    def __str__(self):
+        return f'{self.user} → {self.author}'
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'author'),
+                name='unique_follow',
+            ),
+        )
+        indexes = (
+            models.Index(fields=('user', 'fanout_on_read')),
+        )
+        verbose_name = 'Подписка'
+        verbose_name_plural = 'Подписки'
+
+
+class FeedEntry(models.Model):
+    """Пост в ленте подписчика, разложенный туда при публикации."""
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='feed_entries',
+        verbose_name='Подписчик'
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='feed_entries',
+        verbose_name='Пост'
+    )
+    pub_date = models.DateTimeField(verbose_name='Дата Публикации')
+
     class Meta:
         ordering = ('-pub_date',)
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'post'),
+                name='unique_feed_entry',
+            ),
+        )
+        indexes = (
+            models.Index(fields=('user', '-pub_date')),
+        )
+        verbose_name = 'Запись ленты'
+        verbose_name_plural = 'Записи ленты'
@@ -0,0 +1,81 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from posts.models import ArchivedPost, Post
+
+
+def period_range(year, month=None):
+    """Полуоткрытый интервал [начало, конец) года или месяца.
+
+    Фильтр pub_date__gte/pub_date__lt идёт по индексу, в отличие от
+    pub_date__year и pub_date__month, которые извлекают части даты
+    из каждой строки.
+    """
+    if month is None:
+        start, end = datetime(year, 1, 1), datetime(year + 1, 1, 1)
+    elif month == 12:
+        start, end = datetime(year, 12, 1), datetime(year + 1, 1, 1)
+    else:
+        start, end = datetime(year, month, 1), datetime(year, month + 1, 1)
+    return timezone.make_aware(start), timezone.make_aware(end)
+
+
+def month_of(pub_date):
+    pub_date = timezone.localtime(pub_date)
+    return pub_date.year, pub_date.month
+
+
+def month_histogram_key(group_id=None):
+    return f'month_histogram:{group_id or "all"}'
+
+
+def month_histogram(group_id=None):
+    """Число постов по месяцам: {(год, месяц): количество}.
+
+    Строится агрегирующим запросом к обеим таблицам постов только при
+    пустом кеше, который сбрасывает invalidate_month_histograms().
+    """
+    key = month_histogram_key(group_id)
+    histogram = cache.get(key)
+    if histogram is not None:
+        return histogram
+    histogram = {}
+    for model in (Post, ArchivedPost):
+        queryset = model.objects.all()
+        if group_id is not None:
+            queryset = queryset.filter(group_id=group_id)
+        rows = queryset.annotate(
+            month=TruncMonth('pub_date')
+        ).values('month').annotate(posts=Count('id')).order_by()
+        for row in rows:
+            month = month_of(row['month'])
+            histogram[month] = histogram.get(month, 0) + row['posts']
+    cache.set(key, histogram, settings.MONTH_HISTOGRAM_CACHE_TIMEOUT)
+    return histogram
+
+
+def invalidate_month_histograms(group_ids):
+    """Сбрасывает общую гистограмму и гистограммы групп group_ids.
+
+    Гистограммы не правятся на месте: чтение, изменение и запись значения
+    в общем кеше из нескольких процессов теряли бы одновременные
+    изменения. Сброшенная гистограмма строится заново при первом
+    обращении.
+    """
+    cache.delete_many([month_histogram_key()] + [
+        month_histogram_key(group_id)
+        for group_id in set(group_ids) if group_id is not None
+    ])
+
+
+def month_list(histogram):
+    return [
+        {'date': datetime(year, month, 1), 'year': year, 'month': month,
+         'posts': posts}
+        for (year, month), posts in sorted(histogram.items(), reverse=True)
+    ]
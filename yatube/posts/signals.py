@@ -0,0 +1,77 @@
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from posts.middleware import invalidate_pages, invalidate_post_page
+from posts.models import Comment, Group, Post
+from posts.months import invalidate_month_histograms
+from posts.stats import author_stats_key, refresh_group_stats
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_page_cache(sender, **kwargs):
+    invalidate_pages()
+
+
+# Списки не сбрасываются: счётчик комментариев в карточках обновится
+# по истечении PAGE_CACHE_TIMEOUT
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_commented_post_page(sender, instance, **kwargs):
+    invalidate_post_page(instance.post_id)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_author_stats(sender, instance, **kwargs):
+    cache.delete(author_stats_key(instance.author_id))
+
+
+# Подключён раньше update_group_stats, который сбрасывает _initial_group_id
+@receiver(post_save, sender=Post)
+def invalidate_saved_post_months(sender, instance, created, **kwargs):
+    if created or instance.group_id != instance._initial_group_id:
+        invalidate_month_histograms(
+            [instance._initial_group_id, instance.group_id]
+        )
+
+
+@receiver(post_save, sender=Post)
+def update_group_stats(sender, instance, created, **kwargs):
+    if created and instance.group_id:
+        Group.objects.filter(pk=instance.group_id).update(
+            posts_count=F('posts_count') + 1,
+            last_post_date=instance.pub_date,
+        )
+    elif not created and instance.group_id != instance._initial_group_id:
+        refresh_group_stats(instance._initial_group_id, instance.group_id)
+    instance._initial_group_id = instance.group_id
+
+
+@receiver(post_delete, sender=Post)
+def refresh_deleted_post_group(sender, instance, **kwargs):
+    refresh_group_stats(instance.group_id)
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_deleted_post_months(sender, instance, **kwargs):
+    invalidate_month_histograms([instance.group_id])
+
+
+@receiver(post_save, sender=Comment)
+def increment_comments_count(sender, instance, created, **kwargs):
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(
+            comments_count=F('comments_count') + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comments_count(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id).update(
+        comments_count=F('comments_count') - 1
+    )
@@ -0,0 +1,193 @@
+import json
+import os
+import tempfile
+from heapq import merge
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Count, ExpressionWrapper, F, IntegerField, Max
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.models import ArchivedPost, Group, Post
+
+User = get_user_model()
+
+INDEX_NAME = 'sitemap.xml'
+MANIFEST_NAME = 'manifest.json'
+HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<{tag} xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+
+
+def chunk_file_name(section, number):
+    return f'sitemap-{section}-{number}.xml'
+
+
+def write_atomic(name, lines):
+    """Пишет файл во временный и подменяет им старый одним rename."""
+    root = settings.SITEMAP_ROOT
+    os.makedirs(root, exist_ok=True)
+    descriptor, temp_path = tempfile.mkstemp(dir=root, prefix='.sitemap-')
+    try:
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as temp_file:
+            temp_file.writelines(lines)
+        os.replace(temp_path, os.path.join(root, name))
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def remove(name):
+    try:
+        os.remove(os.path.join(settings.SITEMAP_ROOT, name))
+    except FileNotFoundError:
+        pass
+
+
+def url_lines(urls):
+    yield HEADER.format(tag='urlset')
+    for path, lastmod in urls:
+        yield f'<url><loc>{escape(settings.SITEMAP_BASE_URL + path)}</loc>'
+        if lastmod is not None:
+            yield f'<lastmod>{lastmod.date().isoformat()}</lastmod>'
+        yield '</url>\n'
+    yield '</urlset>\n'
+
+
+def post_chunk_signatures(size):
+    """Число постов и время последнего изменения по каждому чанку.
+
+    Чанк — диапазон id [n * size, (n + 1) * size), поэтому пост всегда
+    попадает в один и тот же чанк, а изменение поста меняет подпись
+    только его чанка.
+    """
+    signatures = {}
+    for model in (Post, ArchivedPost):
+        rows = model.objects.annotate(
+            chunk=ExpressionWrapper(
+                F('pk') / size, output_field=IntegerField()
+            )
+        ).values('chunk').annotate(
+            posts=Count('pk'), updated=Max('updated')
+        ).order_by()
+        for row in rows:
+            posts, updated = signatures.get(row['chunk'], (0, row['updated']))
+            signatures[row['chunk']] = (
+                posts + row['posts'], max(updated, row['updated'])
+            )
+    return {
+        str(chunk): f'{posts}:{updated.isoformat()}'
+        for chunk, (posts, updated) in signatures.items()
+    }
+
+
+def post_chunk_urls(chunk, size):
+    """URL постов чанка по возрастанию id из обеих таблиц."""
+    tiers = (
+        model.objects.filter(
+            pk__gte=chunk * size, pk__lt=(chunk + 1) * size
+        ).order_by('pk').values_list('pk', 'updated').iterator()
+        for model in (Post, ArchivedPost)
+    )
+    for post_id, updated in merge(*tiers):
+        yield reverse('posts:post_detail', args=(post_id,)), updated
+
+
+def keyset_chunks(queryset, field, size):
+    """Делит выборку на чанки по size строк без OFFSET."""
+    last = None
+    while True:
+        page = queryset.order_by('pk')
+        if last is not None:
+            page = page.filter(pk__gt=last)
+        rows = list(page.values_list('pk', field)[:size])
+        if not rows:
+            return
+        yield [value for _, value in rows]
+        last = rows[-1][0]
+
+
+def build_sitemaps(full=False):
+    """Обновляет файлы карты сайта в SITEMAP_ROOT.
+
+    Чанки постов перестраиваются, только если изменилась их подпись в
+    манифесте (число постов или последнее изменение) или передан full.
+    Профили и группы пересчитываются целиком. Возвращает список
+    перестроенных файлов.
+    """
+    root = settings.SITEMAP_ROOT
+    size = settings.SITEMAP_CHUNK_SIZE
+    manifest_path = os.path.join(root, MANIFEST_NAME)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as manifest_file:
+            manifest = json.load(manifest_file)
+    stale = set(manifest.get('posts', {}))
+    previous = {}
+    if not full and manifest.get('chunk_size') == size:
+        previous = manifest['posts']
+    signatures = post_chunk_signatures(size)
+    now = timezone.now().isoformat()
+    built = []
+    files = {}
+
+    for chunk, signature in sorted(
+        signatures.items(), key=lambda item: int(item[0])
+    ):
+        name = chunk_file_name('posts', chunk)
+        if previous.get(chunk, {}).get('signature') != signature:
+            write_atomic(name, url_lines(post_chunk_urls(int(chunk), size)))
+            built.append(name)
+            files[name] = now
+        else:
+            files[name] = previous[chunk]['lastmod']
+    for chunk in stale - set(signatures):
+        remove(chunk_file_name('posts', chunk))
+
+    for section, queryset, field, url_name in (
+        ('profiles', User.objects.filter(is_active=True), 'username',
+         'posts:profile'),
+        ('groups', Group.objects.all(), 'slug', 'posts:group_list'),
+    ):
+        numbers = range(manifest.get(section, 0))
+        count = 0
+        for count, values in enumerate(
+            keyset_chunks(queryset, field, size), start=1
+        ):
+            name = chunk_file_name(section, count)
+            write_atomic(name, url_lines(
+                (reverse(url_name, args=(value,)), None) for value in values
+            ))
+            built.append(name)
+            files[name] = now
+        for number in numbers[count:]:
+            remove(chunk_file_name(section, number + 1))
+        manifest[section] = count
+
+    lines = [HEADER.format(tag='sitemapindex')]
+    lines.extend(
+        f'<sitemap><loc>{escape(settings.SITEMAP_BASE_URL + path)}</loc>'
+        f'<lastmod>{lastmod[:10]}</lastmod></sitemap>\n'
+        for path, lastmod in (
+            (reverse('posts:sitemap', args=(name,)), lastmod)
+            for name, lastmod in files.items()
+        )
+    )
+    lines.append('</sitemapindex>\n')
+    write_atomic(INDEX_NAME, lines)
+    manifest.update({
+        'chunk_size': size,
+        'posts': {
+            chunk: {
+                'signature': signature,
+                'lastmod': files[chunk_file_name('posts', chunk)],
+            }
+            for chunk, signature in signatures.items()
+        },
+    })
+    write_atomic(MANIFEST_NAME, [json.dumps(manifest)])
+    return built
@@ -0,0 +1,105 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import (
+    Count, DateTimeField, IntegerField, Max, Min, OuterRef, Q, Subquery
+)
+from django.db.models.functions import Coalesce
+
+from posts.models import ArchivedPost, Group, Post
+
+
+def author_stats_key(author_id):
+    return f'author_stats:{author_id}'
+
+
+def _group_rows(queryset, author):
+    return (
+        queryset.filter(author=author)
+        .values('group__title', 'group__slug')
+        .annotate(
+            posts=Count('id'),
+            images=Count('id', filter=~Q(image='')),
+            first=Min('pub_date'),
+            last=Max('pub_date'),
+        )
+        .order_by()
+    )
+
+
+def author_stats(author):
+    """Статистика автора: посты по группам, картинки, первый и последний пост.
+
+    Считается одним агрегирующим запросом с группировкой по группе для
+    каждой таблицы постов (основной и архивной) и кешируется до изменения
+    постов автора.
+    """
+    key = author_stats_key(author.pk)
+    stats = cache.get(key)
+    if stats is not None:
+        return stats
+    groups = {}
+    for model in (Post, ArchivedPost):
+        for row in _group_rows(model.objects, author):
+            group = groups.setdefault(row['group__slug'], {
+                'title': row['group__title'],
+                'slug': row['group__slug'],
+                'posts': 0,
+                'images': 0,
+                'first': row['first'],
+                'last': row['last'],
+            })
+            group['posts'] += row['posts']
+            group['images'] += row['images']
+            group['first'] = min(group['first'], row['first'])
+            group['last'] = max(group['last'], row['last'])
+    groups = sorted(
+        groups.values(), key=lambda group: group['posts'], reverse=True
+    )
+    stats = {
+        'posts': sum(group['posts'] for group in groups),
+        'images': sum(group['images'] for group in groups),
+        'first': min((group['first'] for group in groups), default=None),
+        'last': max((group['last'] for group in groups), default=None),
+        'groups': [group for group in groups if group['slug']],
+    }
+    cache.set(key, stats, settings.AUTHOR_STATS_CACHE_TIMEOUT)
+    return stats
+
+
+def group_aggregate(model, aggregate, output_field):
+    """Агрегат по постам группы отдельным подзапросом.
+
+    Подзапросы для основной и архивной таблиц не соединяются друг с
+    другом, поэтому число строк не перемножается. output_field нужен,
+    чтобы SQLite вернул дату с часовым поясом, а не наивную строку.
+    """
+    return Subquery(
+        model.objects.filter(group=OuterRef('pk')).order_by()
+        .values('group').annotate(value=aggregate).values('value'),
+        output_field=output_field,
+    )
+
+
+def refresh_group_stats(*group_ids):
+    """Пересчитывает хранимые счётчики групп одним запросом с annotate."""
+    groups = Group.objects.filter(
+        pk__in=[group_id for group_id in group_ids if group_id]
+    ).annotate(
+        hot_count=Coalesce(
+            group_aggregate(Post, Count('pk'), IntegerField()), 0
+        ),
+        archive_count=Coalesce(
+            group_aggregate(ArchivedPost, Count('pk'), IntegerField()), 0
+        ),
+        hot_last=group_aggregate(Post, Max('pub_date'), DateTimeField()),
+        archive_last=group_aggregate(
+            ArchivedPost, Max('pub_date'), DateTimeField()
+        ),
+    ).values_list(
+        'pk', 'hot_count', 'archive_count', 'hot_last', 'archive_last'
+    )
+    for pk, hot_count, archive_count, hot_last, archive_last in groups:
+        Group.objects.filter(pk=pk).update(
+            posts_count=hot_count + archive_count,
+            last_post_date=hot_last or archive_last,
+        )
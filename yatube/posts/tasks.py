@@ -0,0 +1,20 @@
+from core.images import renditions
+from core.tasks import task
+from posts.feed import fan_out
+from posts.models import Post
+from posts.thumbnails import generate_list_thumbnails
+
+
+@task
+def post_saved(post_id, created=False):
+    """Побочные действия после создания или редактирования поста."""
+    post = Post.objects.filter(pk=post_id).only(
+        'image', 'author', 'pub_date'
+    ).first()
+    if post is None:
+        return
+    if created:
+        fan_out(post)
+    if post.image:
+        renditions(post.image)
+        generate_list_thumbnails([post.image.name])
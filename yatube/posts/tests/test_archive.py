@@ -0,0 +1,156 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.middleware import page_cache_version
+from posts.models import ArchivedPost, Comment, Group, Post
+
+User = get_user_model()
+
+
+class ArchivePostsTests(TestCase):
+    HOT_POSTS = 12
+    OLD_POSTS = 3
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='тестовое описание группы'
+        )
+        posts = [
+            Post.objects.create(
+                text=f'Тестовый пост номер {number}',
+                author=cls.user,
+                group=cls.group,
+            )
+            for number in range(cls.HOT_POSTS + cls.OLD_POSTS)
+        ]
+        cls.old_ids = [post.id for post in posts[:cls.OLD_POSTS]]
+        Post.objects.filter(id__in=cls.old_ids).update(
+            pub_date=timezone.now() - timedelta(days=365)
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+        call_command('archive_posts', days=30, batch_size=2, stdout=StringIO())
+
+    # Проверка, что перенос не сбрасывает кеш страниц и счётчики групп
+    def test_archive_without_side_effects(self):
+        post = Post.objects.create(
+            text='Ещё старый пост', author=self.user, group=self.group
+        )
+        Post.objects.filter(pk=post.pk).update(
+            pub_date=timezone.now() - timedelta(days=365)
+        )
+        version = page_cache_version()
+        posts_count = Group.objects.get(pk=self.group.pk).posts_count
+        call_command('archive_posts', days=30, stdout=StringIO())
+        self.assertTrue(ArchivedPost.objects.filter(pk=post.pk).exists())
+        self.assertEqual(page_cache_version(), version)
+        self.assertEqual(
+            Group.objects.get(pk=self.group.pk).posts_count, posts_count
+        )
+
+    # Проверка, что старые посты перенесены в архив с теми же id
+    def test_old_posts_moved_to_archive(self):
+        self.assertFalse(Post.objects.filter(id__in=self.old_ids).exists())
+        self.assertEqual(
+            set(ArchivedPost.objects.values_list('id', flat=True)),
+            set(self.old_ids),
+        )
+        self.assertEqual(Post.objects.count(), self.HOT_POSTS)
+
+    # Проверка, что страница архивного поста доступна по старому адресу
+    def test_archived_post_detail(self):
+        response = self.guest_client.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.old_ids[0]})
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['post'].id, self.old_ids[0])
+        self.assertTrue(response.context['post'].is_archived)
+
+    # Проверка, что списки продолжаются архивными постами
+    def test_lists_fall_through_to_archive(self):
+        last_page = (
+            (self.HOT_POSTS + self.OLD_POSTS - 1) // settings.POSTS_ON_PAGE
+            + 1
+        )
+        url_list = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': self.user.username}),
+        )
+        for url in url_list:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url, {'page': last_page})
+                page_obj = response.context['page_obj']
+                self.assertEqual(
+                    page_obj.paginator.count,
+                    self.HOT_POSTS + self.OLD_POSTS,
+                )
+                self.assertEqual(
+                    {post.id for post in page_obj if post.is_archived},
+                    set(self.old_ids),
+                )
+
+
+class ArchiveOrderTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='тестовое описание группы'
+        )
+        for number in range(settings.POSTS_ON_PAGE):
+            Post.objects.create(
+                text=f'Свежий пост {number}', author=cls.user, group=cls.group
+            )
+        cls.commented, cls.newer, cls.oldest = [
+            Post.objects.create(text=text, author=cls.user, group=cls.group)
+            for text in (
+                'Пост с комментарием', 'Пост без комментариев',
+                'Самый старый пост',
+            )
+        ]
+        Comment.objects.create(
+            post=cls.commented, author=cls.user, text='комментарий'
+        )
+        for post, days in (
+            (cls.newer, 400), (cls.commented, 700), (cls.oldest, 800)
+        ):
+            Post.objects.filter(pk=post.pk).update(
+                pub_date=timezone.now() - timedelta(days=days)
+            )
+
+    # Проверка, что пост с комментарием не нарушает порядок списков
+    def test_commented_post_keeps_order(self):
+        call_command('archive_posts', days=30, stdout=StringIO())
+        self.assertTrue(Post.objects.filter(pk=self.newer.pk).exists())
+        self.assertTrue(
+            ArchivedPost.objects.filter(pk=self.oldest.pk).exists()
+        )
+        url_list = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': self.user.username}),
+        )
+        for url in url_list:
+            with self.subTest(url=url):
+                response = self.client.get(url, {'page': 2})
+                self.assertEqual(
+                    [post.id for post in response.context['page_obj']],
+                    [self.newer.id, self.commented.id, self.oldest.id],
+                )
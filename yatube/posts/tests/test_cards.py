@@ -0,0 +1,85 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Comment, Group, Post
+
+User = get_user_model()
+
+
+@override_settings(POST_CARD_CACHE_TIMEOUT=600)
+class PostCardCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='описание'
+        )
+        cls.first = Post.objects.create(
+            text='Первый пост', author=cls.user, group=cls.group
+        )
+        cls.second = Post.objects.create(
+            text='Второй пост', author=cls.user, group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def stale(self, post):
+        """Меняет текст в базе, не меняя Post.updated."""
+        Post.objects.filter(pk=post.pk).update(
+            text='Устаревший текст', excerpt='Устаревший текст'
+        )
+
+    # Проверка, что карточка с главной используется в профиле автора
+    def test_card_shared_between_pages(self):
+        self.client.get(reverse('posts:index'))
+        self.stale(self.first)
+        response = self.client.get(
+            reverse('posts:profile', kwargs={'username': 'auth'})
+        )
+        self.assertContains(response, 'Первый пост')
+        self.assertNotContains(response, 'Устаревший текст')
+
+    # Проверка, что без ссылки на группу карточка кешируется отдельно
+    def test_show_link_in_key(self):
+        self.client.get(reverse('posts:index'))
+        response = self.client.get(
+            reverse('posts:group_list', kwargs={'slug': 'group'})
+        )
+        self.assertNotContains(response, 'все записи группы')
+
+    # Проверка, что после правки заново рисуется только карточка поста
+    def test_edit_renders_one_card(self):
+        self.client.get(reverse('posts:index'))
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.first.pk}),
+            data={'text': 'Исправленный пост', 'group': self.group.pk},
+        )
+        self.stale(self.second)
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, 'Исправленный пост')
+        self.assertContains(response, 'Второй пост')
+
+    # Проверка, что новый комментарий обновляет счётчик в карточке
+    def test_comments_count_in_key(self):
+        self.client.get(reverse('posts:index'))
+        Comment.objects.create(
+            post=self.first, author=self.user, text='комментарий'
+        )
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, 'Комментариев: 1')
+
+    # Проверка, что потоковая отдача берёт карточки из того же кеша
+    @override_settings(STREAM_LIST_PAGES=True)
+    def test_streaming_uses_cards(self):
+        b''.join(self.client.get(reverse('posts:index')).streaming_content)
+        self.stale(self.first)
+        response = self.client.get(reverse('posts:index'))
+        content = b''.join(response.streaming_content).decode()
+        self.assertIn('Первый пост', content)
+        self.assertEqual(content.count('<article>'), 2)
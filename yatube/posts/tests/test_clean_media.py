@@ -0,0 +1,139 @@
+import shutil
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from sorl.thumbnail import default, get_thumbnail
+from sorl.thumbnail.images import ImageFile
+
+from core.images import renditions
+from posts.media import walk_storage
+from posts.models import Post
+
+User = get_user_model()
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+@override_settings(
+    DEFAULT_FILE_STORAGE='core.storage.InMemoryStorage',
+    THUMBNAIL_STORAGE='core.storage.InMemoryStorage',
+)
+class CleanMediaTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+
+    def setUp(self):
+        cache.clear()
+        self.storage = Post._meta.get_field('image').storage
+        self.storage.clear()
+        self.post = self.create_post(0)
+        self.orphan = self.create_post(1)
+        self.orphan_name = self.orphan.image.name
+        self.orphan.delete()
+
+    def create_post(self, number):
+        return Post.objects.create(
+            text='Пост с картинкой',
+            author=self.user,
+            image=SimpleUploadedFile(
+                f'small{number}.gif', SMALL_GIF + bytes([number]),
+                'image/gif',
+            ),
+        )
+
+    def thumbnail(self, image):
+        return get_thumbnail(image, settings.POST_LIST_THUMBNAIL).name
+
+    def url_exists(self, url):
+        return self.storage.exists(url[len(settings.MEDIA_URL):])
+
+    def clean_media(self, *args):
+        out = StringIO()
+        call_command('clean_media', *args, stdout=out)
+        return out.getvalue()
+
+    # Проверка удаления картинки без ссылок и её миниатюр
+    def test_orphan_deleted(self):
+        kept = self.thumbnail(self.post.image)
+        orphan = self.thumbnail(Post(image=self.orphan_name).image)
+        output = self.clean_media('--min-age', '0')
+        self.assertIn('картинок 1', output)
+        self.assertTrue(self.storage.exists(self.post.image.name))
+        self.assertTrue(self.storage.exists(kept))
+        self.assertFalse(self.storage.exists(self.orphan_name))
+        self.assertFalse(self.storage.exists(orphan))
+        self.assertIsNone(
+            default.kvstore.get(ImageFile(self.orphan_name, self.storage))
+        )
+
+    # Проверка, что повторно загруженная картинка получает новые копии
+    def test_renditions_rebuilt_after_reupload(self):
+        orphan = Post(image=self.orphan_name).image
+        before = renditions(orphan)
+        self.clean_media('--min-age', '0')
+        for item in before['fallback']:
+            self.assertFalse(self.url_exists(item['url']))
+        name = self.storage.save(
+            self.orphan_name, ContentFile(SMALL_GIF + bytes([1]))
+        )
+        self.assertEqual(name, self.orphan_name)
+        for item in renditions(Post(image=name).image)['fallback']:
+            self.assertTrue(self.url_exists(item['url']))
+
+    # Проверка, что в режиме --dry-run файлы не удаляются
+    def test_dry_run(self):
+        output = self.clean_media('--min-age', '0', '--dry-run')
+        self.assertIn('К удалению: картинок 1', output)
+        self.assertTrue(self.storage.exists(self.orphan_name))
+
+    # Проверка, что свежие файлы не удаляются
+    def test_fresh_file_kept(self):
+        self.clean_media()
+        self.assertTrue(self.storage.exists(self.orphan_name))
+
+    # Проверка удаления миниатюр, о которых не знает sorl-thumbnail
+    def test_stray_thumbnail_deleted(self):
+        kept = self.thumbnail(self.post.image)
+        stray = self.storage.save('cache/00/stray.jpg', ContentFile(b'x'))
+        output = self.clean_media('--min-age', '0', '--batch-size', '1')
+        self.assertIn('миниатюр без записи 1', output)
+        self.assertFalse(self.storage.exists(stray))
+        self.assertTrue(self.storage.exists(kept))
+
+
+class WalkStorageTests(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(dir=settings.BASE_DIR)
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+
+    # Проверка обхода файлового хранилища через os.scandir
+    def test_scandir(self):
+        storage = FileSystemStorage(location=self.root)
+        storage.save('posts/ab/image.gif', ContentFile(SMALL_GIF))
+        storage.save('posts/top.gif', ContentFile(b'xy'))
+        storage.save('posts/ab/.upload-tmp', ContentFile(b'z'))
+        files = {
+            name: size for name, size, _ in walk_storage(storage, 'posts')
+        }
+        self.assertEqual(files, {
+            'posts/ab/image.gif': len(SMALL_GIF),
+            'posts/top.gif': 2,
+        })
+        self.assertEqual(list(walk_storage(storage, 'missing')), [])
@@ -0,0 +1,119 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.archive import move_to_archive
+from posts.models import ArchivedPost, Comment, Post
+from posts.stats import author_stats, author_stats_key
+
+User = get_user_model()
+
+
+class CommentTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.post = Post.objects.create(text='Пост', author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.reader)
+        self.detail_url = reverse(
+            'posts:post_detail', kwargs={'post_id': self.post.pk}
+        )
+        self.comment_url = reverse(
+            'posts:add_comment', kwargs={'post_id': self.post.pk}
+        )
+
+    # Проверка добавления комментария и счётчика
+    def test_add_comment(self):
+        response = self.authorized_client.post(
+            self.comment_url, {'text': 'Комментарий'}
+        )
+        self.assertRedirects(response, self.detail_url)
+        comment = Comment.objects.get()
+        self.assertEqual(comment.author, self.reader)
+        self.assertEqual(comment.post, self.post)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 1)
+        response = self.guest_client.get(self.detail_url)
+        self.assertContains(response, 'Комментарий')
+
+    # Проверка, что гость не может комментировать
+    def test_guest_cannot_comment(self):
+        response = self.guest_client.post(
+            self.comment_url, {'text': 'Комментарий'}
+        )
+        self.assertRedirects(
+            response, f'/auth/login/?next={self.comment_url}'
+        )
+        self.assertFalse(Comment.objects.exists())
+
+    # Проверка, что некорректный parent не приводит к ошибке сервера
+    def test_invalid_parent(self):
+        response = self.authorized_client.post(
+            self.comment_url, {'text': 'Ответ', 'parent': 'abc'}
+        )
+        self.assertRedirects(response, self.detail_url)
+        self.assertFalse(Comment.objects.filter(text='Ответ').exists())
+
+    # Проверка ответа на комментарий
+    def test_reply(self):
+        comment = Comment.objects.create(
+            post=self.post, author=self.author, text='Вопрос'
+        )
+        self.authorized_client.post(
+            self.comment_url, {'text': 'Ответ', 'parent': comment.pk}
+        )
+        reply = Comment.objects.get(text='Ответ')
+        self.assertEqual(reply.parent, comment)
+        response = self.guest_client.get(self.detail_url)
+        self.assertEqual(list(response.context['comments']), [comment])
+
+    # Проверка уменьшения счётчика при удалении комментария
+    def test_delete_comment_updates_count(self):
+        comment = Comment.objects.create(
+            post=self.post, author=self.author, text='Комментарий'
+        )
+        comment.delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 0)
+
+    # Проверка, что комментарий не сбрасывает кеш статистики автора
+    def test_comment_keeps_author_stats_cache(self):
+        author_stats(self.author)
+        self.authorized_client.post(self.comment_url, {'text': 'Текст'})
+        self.assertIsNotNone(cache.get(author_stats_key(self.author.pk)))
+
+    # Проверка, что число запросов не зависит от числа комментариев
+    def test_detail_query_count_is_fixed(self):
+        self.guest_client.get(self.detail_url)
+        with self.assertNumQueries(3):
+            self.guest_client.get(self.detail_url)
+        for number in range(5):
+            comment = Comment.objects.create(
+                post=self.post, author=self.reader, text=f'К {number}'
+            )
+            Comment.objects.create(
+                post=self.post, author=self.author, text='Ответ',
+                parent=comment,
+            )
+        with self.assertNumQueries(5):
+            self.guest_client.get(self.detail_url)
+
+    # Проверка, что посты с комментариями не уходят в архив
+    def test_commented_post_is_not_archived(self):
+        Comment.objects.create(
+            post=self.post, author=self.reader, text='Комментарий'
+        )
+        move_to_archive(timezone.now() + timedelta(days=1), 100)
+        self.assertTrue(Post.objects.filter(pk=self.post.pk).exists())
+        self.assertFalse(ArchivedPost.objects.exists())
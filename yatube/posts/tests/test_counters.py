@@ -0,0 +1,124 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.counters import ViewCounter, post_views
+from posts.models import Post
+
+User = get_user_model()
+
+
+class ViewCounterTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.posts = [
+            Post.objects.create(text=f'Пост {number}', author=cls.user)
+            for number in range(3)
+        ]
+
+    def setUp(self):
+        post_views.clear()
+        self.guest_client = Client()
+
+    def updates(self, counter):
+        with CaptureQueriesContext(connection) as queries:
+            counter.flush()
+        return [
+            query['sql'] for query in queries
+            if query['sql'].startswith('UPDATE')
+        ]
+
+    def views(self):
+        return list(
+            Post.objects.order_by('pk').values_list('views', flat=True)
+        )
+
+    # Проверка, что просмотр копится в буфере и записывается при сбросе
+    def test_detail_view_is_buffered(self):
+        url = reverse(
+            'posts:post_detail', kwargs={'post_id': self.posts[0].pk}
+        )
+        for _ in range(3):
+            self.guest_client.get(url)
+        self.assertEqual(self.views(), [0, 0, 0])
+        self.assertEqual(post_views.flush(), 1)
+        self.assertEqual(self.views(), [3, 0, 0])
+
+    # Проверка, что сброс выполняется одним запросом
+    def test_flush_is_single_update(self):
+        counter = ViewCounter()
+        for post in self.posts:
+            for _ in range(post.pk):
+                counter.record(post.pk)
+        self.assertEqual(len(self.updates(counter)), 1)
+        self.assertEqual(
+            self.views(), [post.pk for post in self.posts]
+        )
+
+    # Проверка, что посты разбиваются на пачки
+    @override_settings(POST_VIEWS_FLUSH_BATCH_SIZE=2)
+    def test_flush_in_batches(self):
+        counter = ViewCounter()
+        for post in self.posts:
+            counter.record(post.pk)
+        self.assertEqual(len(self.updates(counter)), 2)
+        self.assertEqual(self.views(), [1, 1, 1])
+
+    # Проверка сброса по истечении интервала
+    @override_settings(POST_VIEWS_FLUSH_INTERVAL=0)
+    def test_flush_after_interval(self):
+        counter = ViewCounter()
+        counter.record(self.posts[0].pk)
+        self.assertEqual(self.views(), [1, 0, 0])
+        self.assertFalse(counter.pending)
+
+    # Проверка, что при ошибке записи просмотры не теряются
+    def test_failed_flush_keeps_views(self):
+        counter = ViewCounter()
+        counter.record(self.posts[0].pk)
+        with mock.patch(
+            'posts.counters.write_views', side_effect=RuntimeError
+        ), self.assertLogs('posts.counters', 'ERROR'):
+            self.assertEqual(counter.flush(), 0)
+        counter.record(self.posts[0].pk)
+        counter.flush()
+        self.assertEqual(self.views(), [2, 0, 0])
+
+    # Проверка, что при параллельной записи и сбросах ничего не теряется
+    def test_concurrent_record_and_flush(self):
+        counter = ViewCounter()
+        written = []
+        lock = threading.Lock()
+
+        def write(pending):
+            with lock:
+                written.append(dict(pending))
+
+        def worker(post_id):
+            for number in range(1000):
+                counter.record(post_id)
+                if number % 100 == 0:
+                    counter.flush()
+
+        threads = [
+            threading.Thread(target=worker, args=(post.pk,))
+            for post in self.posts
+            for _ in range(4)
+        ]
+        with mock.patch('posts.counters.write_views', write):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            counter.flush()
+        for post in self.posts:
+            self.assertEqual(
+                sum(batch.get(post.pk, 0) for batch in written), 4000
+            )
@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.archive import move_to_archive
+from posts.models import Group, Post
+from posts.months import month_histogram, month_histogram_key, period_range
+
+User = get_user_model()
+
+
+class DateArchiveTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='описание'
+        )
+        cls.other = Group.objects.create(
+            title='Другая', slug='other', description='описание'
+        )
+        cls.dates = {
+            'feb': timezone.make_aware(datetime(2024, 2, 29, 23, 59)),
+            'mar': timezone.make_aware(datetime(2024, 3, 1)),
+            'dec': timezone.make_aware(datetime(2023, 12, 31, 12)),
+        }
+        cls.posts = {}
+        for name, pub_date in cls.dates.items():
+            post = Post.objects.create(
+                text=f'Пост {name}', author=cls.user, group=cls.group
+            )
+            Post.objects.filter(pk=post.pk).update(pub_date=pub_date)
+            cls.posts[name] = post
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def texts(self, response):
+        return [post.text for post in response.context['page_obj']]
+
+    # Проверка границ полуоткрытых интервалов
+    def test_period_range(self):
+        self.assertEqual(
+            period_range(2024, 12),
+            (
+                timezone.make_aware(datetime(2024, 12, 1)),
+                timezone.make_aware(datetime(2025, 1, 1)),
+            ),
+        )
+        self.assertEqual(
+            period_range(2024)[1], timezone.make_aware(datetime(2025, 1, 1))
+        )
+
+    # Проверка архива за месяц и за год
+    def test_month_and_year_archive(self):
+        response = self.guest_client.get(
+            reverse('posts:date_archive', args=(2024, 2))
+        )
+        self.assertEqual(self.texts(response), ['Пост feb'])
+        response = self.guest_client.get(
+            reverse('posts:date_archive', args=(2024,))
+        )
+        self.assertEqual(self.texts(response), ['Пост mar', 'Пост feb'])
+
+    # Проверка архива группы
+    def test_group_archive(self):
+        Post.objects.filter(pk=self.posts['mar'].pk).update(group=self.other)
+        response = self.guest_client.get(
+            reverse('posts:group_date_archive', args=('group', 2024))
+        )
+        self.assertEqual(self.texts(response), ['Пост feb'])
+
+    # Проверка, что несуществующий месяц даёт 404
+    def test_wrong_month(self):
+        response = self.guest_client.get(
+            reverse('posts:date_archive', args=(2024, 13))
+        )
+        self.assertEqual(response.status_code, 404)
+
+    # Проверка, что даты фильтруются диапазоном, а не извлечением частей
+    def test_uses_range_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.guest_client.get(
+                reverse('posts:date_archive', args=(2024, 3))
+            )
+        posts_queries = [
+            query['sql'] for query in queries
+            if 'FROM "posts_post"' in query['sql']
+        ]
+        self.assertTrue(posts_queries)
+        for sql in posts_queries:
+            self.assertNotIn('django_datetime_extract', sql)
+
+    # Проверка гистограммы по месяцам
+    def test_histogram(self):
+        self.assertEqual(
+            month_histogram(),
+            {(2024, 2): 1, (2024, 3): 1, (2023, 12): 1},
+        )
+        self.assertEqual(month_histogram(self.other.pk), {})
+
+    # Проверка сброса гистограммы при изменении постов
+    def test_histogram_invalidated(self):
+        month_histogram()
+        month_histogram(self.group.pk)
+        month_histogram(self.other.pk)
+        post = Post.objects.create(
+            text='Новый', author=self.user, group=self.group
+        )
+        month = (post.pub_date.year, post.pub_date.month)
+        self.assertEqual(month_histogram()[month], 1)
+        self.assertEqual(month_histogram(self.group.pk)[month], 1)
+        post.group = self.other
+        post.save()
+        self.assertNotIn(month, month_histogram(self.group.pk))
+        self.assertEqual(month_histogram(self.other.pk)[month], 1)
+        post.delete()
+        self.assertNotIn(month, month_histogram())
+        self.assertNotIn(month, month_histogram(self.other.pk))
+
+    # Проверка, что одновременные записи не теряют изменений
+    def test_concurrent_updates(self):
+        month_histogram()
+        first = Post(text='Первый', author=self.user)
+        second = Post(text='Второй', author=self.user)
+        stale = cache.get(month_histogram_key())
+        first.save()
+        # Второй процесс записал бы гистограмму, прочитанную до first
+        cache.set(month_histogram_key(), stale)
+        second.save()
+        month = (first.pub_date.year, first.pub_date.month)
+        self.assertEqual(month_histogram()[month], 2)
+
+    # Проверка, что перенос в архив не меняет гистограмму
+    def test_archive_keeps_histogram(self):
+        histogram = month_histogram()
+        move_to_archive(timezone.now() + timedelta(days=1), 2)
+        self.assertFalse(Post.objects.exists())
+        self.assertEqual(month_histogram(), histogram)
+        cache.clear()
+        self.assertEqual(month_histogram(), histogram)
+        response = self.guest_client.get(
+            reverse('posts:date_archive', args=(2024, 2))
+        )
+        self.assertEqual(self.texts(response), ['Пост feb'])
@@ -0,0 +1,69 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import EXCERPT_LENGTH, Post
+
+User = get_user_model()
+
+LONG_TEXT = 'слово ' * 1000
+
+
+class ExcerptTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.post = Post.objects.create(
+            text=LONG_TEXT + 'конец', author=cls.user
+        )
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    # Проверка, что начало текста сохраняется вместе с постом
+    def test_excerpt_on_save(self):
+        self.assertEqual(len(self.post.excerpt), EXCERPT_LENGTH)
+        self.assertTrue(LONG_TEXT.startswith(self.post.excerpt[:-1]))
+        short = Post.objects.create(text='Короткий пост', author=self.user)
+        self.assertEqual(short.excerpt, 'Короткий пост')
+
+    # Проверка, что правка поста обновляет начало текста
+    def test_excerpt_after_edit(self):
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.pk}),
+            data={'text': 'Новый текст'},
+        )
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual(post.excerpt, 'Новый текст')
+
+    # Проверка, что сохранение поста без текста не стирает начало текста
+    def test_save_deferred(self):
+        post = Post.objects.defer('text').get(pk=self.post.pk)
+        post.save()
+        post.refresh_from_db()
+        self.assertEqual(post.excerpt, self.post.excerpt)
+        self.assertEqual(post.text, self.post.text)
+
+    # Проверка, что списки не читают полный текст, а страница поста читает
+    def test_lists_defer_text(self):
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:profile', kwargs={'username': 'auth'}),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url)
+                self.assertNotContains(response, 'конец')
+                self.assertFalse(any(
+                    '"posts_post"."text"' in query['sql']
+                    for query in queries
+                ))
+        response = self.client.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk})
+        )
+        self.assertContains(response, 'конец')
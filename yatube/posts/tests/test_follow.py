@@ -0,0 +1,92 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import FeedEntry, Follow, Post
+
+User = get_user_model()
+
+
+class FollowFeedTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.star = User.objects.create_user(username='star')
+        cls.follower = User.objects.create_user(username='follower')
+        cls.stranger = User.objects.create_user(username='stranger')
+        cls.old_post = Post.objects.create(
+            text='Пост до подписки', author=cls.author
+        )
+
+    def setUp(self):
+        self.follower_client = Client()
+        self.follower_client.force_login(self.follower)
+        self.stranger_client = Client()
+        self.stranger_client.force_login(self.stranger)
+
+    def follow(self, client, author):
+        client.get(
+            reverse('posts:profile_follow', kwargs={'username': author})
+        )
+
+    def create_post(self, author, text):
+        client = Client()
+        client.force_login(author)
+        client.post(reverse('posts:post_create'), {'text': text})
+        return Post.objects.get(text=text)
+
+    def feed(self, client):
+        response = client.get(reverse('posts:follow_index'))
+        return [post.text for post in response.context['page_obj']]
+
+    # Проверка подписки и отписки
+    def test_follow_and_unfollow(self):
+        self.follow(self.follower_client, self.author.username)
+        self.assertTrue(
+            Follow.objects.filter(
+                user=self.follower, author=self.author
+            ).exists()
+        )
+        self.assertEqual(self.feed(self.follower_client), [
+            self.old_post.text
+        ])
+        self.follower_client.get(reverse(
+            'posts:profile_unfollow',
+            kwargs={'username': self.author.username},
+        ))
+        self.assertFalse(Follow.objects.exists())
+        self.assertEqual(self.feed(self.follower_client), [])
+
+    # Проверка, что на себя подписаться нельзя
+    def test_cannot_follow_self(self):
+        self.follow(self.follower_client, self.follower.username)
+        self.assertFalse(Follow.objects.exists())
+
+    # Проверка раскладки нового поста по лентам подписчиков
+    def test_new_post_fanned_out_to_followers(self):
+        self.follow(self.follower_client, self.author.username)
+        post = self.create_post(self.author, 'Новый пост')
+        self.assertTrue(
+            FeedEntry.objects.filter(user=self.follower, post=post).exists()
+        )
+        self.assertEqual(self.feed(self.follower_client)[0], post.text)
+        self.assertEqual(self.feed(self.stranger_client), [])
+
+    # Проверка чтения постов популярного автора при показе ленты
+    @override_settings(FEED_FANOUT_THRESHOLD=2)
+    def test_high_fanout_author_read_on_demand(self):
+        self.follow(self.follower_client, self.author.username)
+        self.follow(self.follower_client, self.star.username)
+        self.follow(self.stranger_client, self.star.username)
+        star_post = self.create_post(self.star, 'Пост звезды')
+        author_post = self.create_post(self.author, 'Пост автора')
+        self.assertFalse(FeedEntry.objects.filter(post=star_post).exists())
+        self.assertTrue(
+            Follow.objects.filter(author=self.star, fanout_on_read=True)
+            .count() == 2
+        )
+        self.assertEqual(self.feed(self.follower_client), [
+            author_post.text, star_post.text, self.old_post.text
+        ])
+        self.assertEqual(self.feed(self.stranger_client), [star_post.text])
@@ -1,8 +1,4 @@
-import shutil
-import tempfile
-
 from django.contrib.auth import get_user_model
-from django.conf import settings
 from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 
@@ -11,10 +7,8 @@ from posts.models import Group, Post
 
 User = get_user_model()
 
-TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
-
 
-@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+@override_settings(DEFAULT_FILE_STORAGE='core.storage.InMemoryStorage')
 class TaskCreateFormTests(TestCase):
     @classmethod
     def setUpClass(cls):
@@ -31,11 +25,6 @@ class TaskCreateFormTests(TestCase):
             group=cls.group,
         )
 
-    @classmethod
-    def tearDownClass(cls):
-        super().tearDownClass()
-        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
-
     def setUp(self):
         self.authorized_client = Client()
         self.authorized_client.force_login(self.user)
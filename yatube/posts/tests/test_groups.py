@@ -0,0 +1,86 @@
+import warnings
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post
+from posts.stats import refresh_group_stats
+
+User = get_user_model()
+
+
+class GroupIndexTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.big_group = Group.objects.create(
+            title='Большая группа',
+            slug='big',
+            description='описание',
+        )
+        cls.fresh_group = Group.objects.create(
+            title='Свежая группа',
+            slug='fresh',
+            description='описание',
+        )
+        cls.empty_group = Group.objects.create(
+            title='Пустая группа',
+            slug='empty',
+            description='описание',
+        )
+        for number in range(3):
+            Post.objects.create(
+                text=f'Пост {number}', author=cls.user, group=cls.big_group
+            )
+        cls.fresh_post = Post.objects.create(
+            text='Свежий пост', author=cls.user, group=cls.fresh_group
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.url = reverse('posts:group_index')
+
+    def get_slugs(self, sort):
+        response = self.guest_client.get(self.url, {'sort': sort})
+        return [group.slug for group in response.context['page_obj']]
+
+    # Проверка сортировки каталога групп
+    def test_group_index_sorting(self):
+        self.assertEqual(
+            self.get_slugs('activity'), ['fresh', 'big', 'empty']
+        )
+        self.assertEqual(self.get_slugs('size'), ['big', 'fresh', 'empty'])
+        self.assertEqual(self.get_slugs('title'), ['big', 'empty', 'fresh'])
+
+    # Проверка, что страница каталога строится одним запросом к группам
+    def test_group_index_queries(self):
+        with self.assertNumQueries(2):
+            response = self.guest_client.get(self.url)
+        self.assertContains(response, 'Постов: 3')
+
+    # Проверка, что дата последнего поста пересчитывается с часовым поясом
+    def test_last_post_date_is_aware(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', RuntimeWarning)
+            refresh_group_stats(self.fresh_group.pk)
+        self.assertEqual(
+            Group.objects.get(pk=self.fresh_group.pk).last_post_date,
+            self.fresh_post.pub_date,
+        )
+
+    # Проверка обновления счётчиков при изменении постов
+    def test_group_stats_follow_post_changes(self):
+        self.fresh_post.group = self.empty_group
+        self.fresh_post.save()
+        Post.objects.filter(group=self.big_group).first().delete()
+        self.assertEqual(
+            {
+                group.slug: group.posts_count
+                for group in Group.objects.all()
+            },
+            {'big': 2, 'fresh': 0, 'empty': 1},
+        )
+        self.fresh_group.refresh_from_db()
+        self.assertIsNone(self.fresh_group.last_post_date)
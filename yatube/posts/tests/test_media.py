@@ -0,0 +1,96 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from posts.models import Post
+
+User = get_user_model()
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+@override_settings(
+    MEDIA_ROOT=TEMP_MEDIA_ROOT,
+    DEFAULT_FILE_STORAGE='core.storage.ContentAddressedStorage',
+    THUMBNAIL_STORAGE='django.core.files.storage.FileSystemStorage',
+)
+class ContentAddressedMediaTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def create_post(self, filename):
+        return Post.objects.create(
+            text='Пост с картинкой',
+            author=self.user,
+            image=SimpleUploadedFile(filename, SMALL_GIF, 'image/gif'),
+        )
+
+    # Проверка, что одинаковые картинки хранятся один раз
+    def test_same_image_stored_once(self):
+        first = self.create_post('meme.gif')
+        second = self.create_post('meme_copy.GIF')
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertTrue(first.image.name.startswith('posts/'))
+        self.assertTrue(first.image.name.endswith('.gif'))
+        directory = os.path.dirname(first.image.path)
+        self.assertEqual(os.listdir(directory), [
+            os.path.basename(first.image.name)
+        ])
+
+    # Проверка, что права файла такие же, как у FileSystemStorage
+    def test_file_permissions(self):
+        umask = os.umask(0o022)
+        self.addCleanup(os.umask, umask)
+        post = self.create_post('permissions.gif')
+        self.assertEqual(os.stat(post.image.path).st_mode & 0o777, 0o644)
+        with override_settings(FILE_UPLOAD_PERMISSIONS=0o640):
+            Post.objects.filter(pk=post.pk).delete()
+            os.remove(post.image.path)
+            post = self.create_post('permissions.gif')
+        self.assertEqual(os.stat(post.image.path).st_mode & 0o777, 0o640)
+
+    # Проверка объединения уже загруженных копий
+    def test_dedupe_media_command(self):
+        os.makedirs(os.path.join(TEMP_MEDIA_ROOT, 'posts'), exist_ok=True)
+        for filename in ('a.gif', 'b.gif'):
+            with open(
+                os.path.join(TEMP_MEDIA_ROOT, 'posts', filename), 'wb'
+            ) as image:
+                image.write(SMALL_GIF)
+            Post.objects.create(
+                text='Старый пост', author=self.user,
+                image=f'posts/{filename}',
+            )
+        call_command('dedupe_media', stdout=StringIO())
+        names = set(Post.objects.values_list('image', flat=True))
+        self.assertEqual(len(names), 1)
+        name = names.pop()
+        self.assertTrue(
+            os.path.exists(os.path.join(TEMP_MEDIA_ROOT, name))
+        )
+        self.assertFalse(
+            os.path.exists(os.path.join(TEMP_MEDIA_ROOT, 'posts', 'a.gif'))
+        )
@@ -0,0 +1,101 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.counters import post_views
+from posts.models import Comment, Group, Post
+
+User = get_user_model()
+
+
+@override_settings(PAGE_CACHE_TIMEOUT=600, PAGE_CACHE_MAX_AGE=60)
+class AnonymousPageCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='описание'
+        )
+        cls.post = Post.objects.create(
+            text='Первый пост', author=cls.user, group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+        post_views.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        self.urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': 'group'}),
+            reverse('posts:profile', kwargs={'username': 'auth'}),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+        )
+
+    # Проверка, что повторный запрос анонима не обращается к базе
+    def test_anonymous_pages_are_cached(self):
+        for url in self.urls:
+            with self.subTest(url=url):
+                first = self.guest_client.get(url)
+                with self.assertNumQueries(0):
+                    second = self.guest_client.get(url)
+                self.assertEqual(first.content, second.content)
+
+    # Проверка заголовков Cache-Control и Vary
+    def test_headers(self):
+        response = self.guest_client.get(self.urls[0])
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn('max-age=60', response['Cache-Control'])
+        self.assertIn('Cookie', response['Vary'])
+
+    # Проверка, что страницы разных номеров кешируются отдельно
+    def test_key_includes_page(self):
+        for number in range(10):
+            Post.objects.create(text=f'Пост {number}', author=self.user)
+        first = self.guest_client.get(self.urls[0])
+        second = self.guest_client.get(self.urls[0] + '?page=2')
+        self.assertNotEqual(first.content, second.content)
+        self.assertContains(second, 'Первый пост')
+
+    # Проверка, что авторизованные пользователи получают свежую страницу
+    def test_authorized_bypass_cache(self):
+        self.guest_client.get(self.urls[0])
+        response = self.authorized_client.get(self.urls[0])
+        self.assertContains(response, 'Новая запись')
+        self.assertNotIn('public', response.get('Cache-Control', ''))
+
+    # Проверка сброса кеша при записи поста и группы
+    def test_invalidation(self):
+        writes = (
+            lambda: Post.objects.create(text='Новый пост', author=self.user),
+            lambda: Group.objects.filter(pk=self.group.pk).first().save(),
+        )
+        for write in writes:
+            self.guest_client.get(self.urls[0])
+            write()
+            with self.assertNumQueries(3):
+                self.guest_client.get(self.urls[0])
+
+    # Проверка, что комментарий сбрасывает только страницу поста
+    def test_comment_invalidates_post_page(self):
+        for url in self.urls:
+            self.guest_client.get(url)
+        Comment.objects.create(
+            post=self.post, author=self.user, text='Новый комментарий'
+        )
+        response = self.guest_client.get(self.urls[3])
+        self.assertContains(response, 'Новый комментарий')
+        for url in self.urls[:3]:
+            with self.subTest(url=url), self.assertNumQueries(0):
+                self.guest_client.get(url)
+
+    # Проверка, что просмотры считаются и для страницы из кеша
+    def test_cached_detail_counts_views(self):
+        self.guest_client.get(self.urls[3])
+        self.guest_client.get(self.urls[3])
+        post_views.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 2)
@@ -0,0 +1,129 @@
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.archive import move_to_archive
+from posts.models import Group, Post
+from posts.sitemaps import build_sitemaps, chunk_file_name
+
+User = get_user_model()
+
+CHUNK_SIZE = 3
+
+
+@override_settings(SITEMAP_CHUNK_SIZE=CHUNK_SIZE)
+class SitemapTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        Group.objects.create(title='Группа', slug='group', description='-')
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        settings_override = override_settings(SITEMAP_ROOT=self.root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.posts = [
+            Post.objects.create(text=f'Пост {number}', author=self.user)
+            for number in range(7)
+        ]
+        self.guest_client = Client()
+
+    def chunk_name(self, post):
+        return chunk_file_name('posts', post.pk // CHUNK_SIZE)
+
+    def read(self, name):
+        with open(os.path.join(self.root, name), encoding='utf-8') as file:
+            return file.read()
+
+    # Проверка, что все посты попадают в карту сайта по чанкам
+    def test_build(self):
+        built = build_sitemaps()
+        chunks = {self.chunk_name(post) for post in self.posts}
+        self.assertEqual(
+            set(built),
+            chunks | {
+                chunk_file_name('profiles', 1), chunk_file_name('groups', 1)
+            },
+        )
+        for post in self.posts:
+            self.assertIn(
+                f'/posts/{post.pk}/</loc>', self.read(self.chunk_name(post))
+            )
+        self.assertIn('/profile/auth/', self.read('sitemap-profiles-1.xml'))
+        index = self.read('sitemap.xml')
+        for name in chunks:
+            self.assertIn(f'/{name}</loc>', index)
+
+    # Проверка, что перестраиваются только чанки с изменёнными постами
+    def test_only_changed_chunks_are_rebuilt(self):
+        build_sitemaps()
+        changed = self.posts[4]
+        changed.text = 'Изменённый пост'
+        changed.save()
+        built = build_sitemaps()
+        self.assertIn(self.chunk_name(changed), built)
+        self.assertEqual(
+            [name for name in built if name.startswith('sitemap-posts')],
+            [self.chunk_name(changed)],
+        )
+        chunks = [self.chunk_name(post) for post in self.posts]
+        deleted = next(
+            post for post, chunk in zip(self.posts, chunks)
+            if chunks.count(chunk) > 1
+        )
+        deleted_id, deleted_chunk = deleted.pk, self.chunk_name(deleted)
+        deleted.delete()
+        built = build_sitemaps()
+        self.assertEqual(
+            [name for name in built if name.startswith('sitemap-posts')],
+            [deleted_chunk],
+        )
+        self.assertNotIn(f'/posts/{deleted_id}/<', self.read(deleted_chunk))
+
+    # Проверка, что перенос в архив не меняет карту сайта
+    def test_archived_posts_stay_in_sitemap(self):
+        build_sitemaps()
+        move_to_archive(self.posts[-1].pub_date, 100)
+        self.assertEqual(
+            [
+                name for name in build_sitemaps()
+                if name.startswith('sitemap-posts')
+            ],
+            [],
+        )
+        self.assertIn(
+            f'/posts/{self.posts[0].pk}/<',
+            self.read(self.chunk_name(self.posts[0])),
+        )
+
+    # Проверка, что пустые чанки удаляются
+    def test_empty_chunk_is_removed(self):
+        build_sitemaps()
+        last = self.posts[-1]
+        Post.objects.filter(
+            pk__gte=last.pk // CHUNK_SIZE * CHUNK_SIZE
+        ).delete()
+        build_sitemaps()
+        self.assertFalse(
+            os.path.exists(os.path.join(self.root, self.chunk_name(last)))
+        )
+        self.assertNotIn(self.chunk_name(last), self.read('sitemap.xml'))
+
+    # Проверка отдачи файлов карты сайта
+    def test_sitemap_view(self):
+        build_sitemaps()
+        response = self.guest_client.get(
+            reverse('posts:sitemap', args=('sitemap.xml',))
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('xml', response['Content-Type'])
+        self.assertIn(b'<sitemapindex', b''.join(response.streaming_content))
+        response = self.guest_client.get('/sitemap-posts-999.xml')
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,78 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post
+from posts.stats import author_stats
+
+User = get_user_model()
+
+
+class AuthorStatsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.groups = [
+            Group.objects.create(
+                title=f'Группа {number}',
+                slug=f'group-{number}',
+                description='описание',
+            )
+            for number in range(3)
+        ]
+        for number in range(6):
+            Post.objects.create(
+                text=f'Пост {number}',
+                author=cls.user,
+                group=cls.groups[number % 2],
+                image='posts/image.gif' if number < 2 else '',
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.url = reverse(
+            'posts:profile', kwargs={'username': self.user.username}
+        )
+
+    # Проверка подсчёта статистики автора
+    def test_author_stats_values(self):
+        stats = author_stats(self.user)
+        self.assertEqual(stats['posts'], 6)
+        self.assertEqual(stats['images'], 2)
+        self.assertEqual(
+            [(group['slug'], group['posts']) for group in stats['groups']],
+            [('group-0', 3), ('group-1', 3)],
+        )
+        posts = Post.objects.filter(author=self.user)
+        self.assertEqual(stats['first'], posts.last().pub_date)
+        self.assertEqual(stats['last'], posts.first().pub_date)
+
+    # Проверка, что число запросов не зависит от числа постов и групп
+    def test_profile_query_count_is_fixed(self):
+        self.guest_client.get(self.url)
+        with self.assertNumQueries(4):
+            self.guest_client.get(self.url)
+        for number in range(10):
+            Post.objects.create(
+                text=f'Ещё пост {number}',
+                author=self.user,
+                group=self.groups[2],
+            )
+        self.guest_client.get(self.url)
+        with self.assertNumQueries(4):
+            response = self.guest_client.get(self.url)
+        self.assertEqual(response.context['stats']['posts'], 16)
+
+    # Проверка сброса кеша при изменении поста автора
+    def test_stats_invalidated_on_post_change(self):
+        self.assertEqual(author_stats(self.user)['posts'], 6)
+        post = Post.objects.filter(author=self.user).first()
+        post.group = self.groups[2]
+        post.save()
+        groups = author_stats(self.user)['groups']
+        self.assertIn('group-2', [group['slug'] for group in groups])
+        post.delete()
+        self.assertEqual(author_stats(self.user)['posts'], 5)
@@ -0,0 +1,75 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+@override_settings(STREAM_LIST_PAGES=True)
+class StreamingListTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='описание'
+        )
+        for number in range(3):
+            Post.objects.create(
+                text=f'Пост номер {number}', author=cls.user, group=cls.group
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    # Проверка, что шапка уходит до запроса постов страницы
+    def test_head_is_sent_before_posts_query(self):
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertTrue(response.streaming)
+        chunks = iter(response.streaming_content)
+        with CaptureQueriesContext(connection) as queries:
+            head = next(chunks).decode()
+        self.assertIn('</head>', head)
+        self.assertNotIn('Пост номер', head)
+        self.assertEqual(len(queries), 0)
+        with CaptureQueriesContext(connection) as queries:
+            body = b''.join(chunks).decode()
+        self.assertTrue(queries)
+        for number in range(3):
+            self.assertIn(f'Пост номер {number}', body)
+        self.assertEqual(body.count('<hr>'), 2)
+        self.assertIn('</html>', body)
+
+    # Проверка, что потоковая страница совпадает с обычной
+    def test_same_content_as_render(self):
+        for url in (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': 'group'}),
+            reverse('posts:profile', kwargs={'username': 'auth'}),
+        ):
+            with self.subTest(url=url):
+                streamed = b''.join(
+                    self.guest_client.get(url).streaming_content
+                )
+                with override_settings(STREAM_LIST_PAGES=False):
+                    rendered = self.guest_client.get(url).content
+                self.assertEqual(
+                    "".join(streamed.decode().split()),
+                    "".join(rendered.decode().split()),
+                )
+
+    # Проверка, что потоковая страница попадает в кеш страниц
+    @override_settings(PAGE_CACHE_TIMEOUT=600)
+    def test_streamed_page_is_cached(self):
+        url = reverse('posts:index')
+        streamed = b''.join(self.guest_client.get(url).streaming_content)
+        with self.assertNumQueries(0):
+            response = self.guest_client.get(url)
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.content, streamed)
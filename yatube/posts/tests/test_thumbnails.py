@@ -0,0 +1,102 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from sorl.thumbnail import default, get_thumbnail
+
+from posts.models import Post
+from posts.thumbnails import LIST_THUMBNAIL_OPTIONS, get_many_thumbnails
+
+User = get_user_model()
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+@override_settings(
+    DEFAULT_FILE_STORAGE='core.storage.InMemoryStorage',
+    THUMBNAIL_STORAGE='core.storage.InMemoryStorage',
+)
+class ListThumbnailsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.posts = [
+            Post.objects.create(
+                text=f'Пост с картинкой {number}',
+                author=cls.user,
+                image=SimpleUploadedFile(
+                    f'small{number}.gif',
+                    SMALL_GIF + bytes([number]),
+                    'image/gif',
+                ),
+            )
+            for number in range(3)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    # Проверка, что готовые миниатюры находятся одним запросом к кешу
+    def test_thumbnails_resolved_with_single_get_many(self):
+        thumbnails = [
+            get_thumbnail(
+                post.image, settings.POST_LIST_THUMBNAIL,
+                **LIST_THUMBNAIL_OPTIONS
+            )
+            for post in self.posts
+        ]
+        kv_cache = default.kvstore.cache
+        with mock.patch.object(
+            kv_cache, 'get_many', wraps=kv_cache.get_many
+        ) as get_many, self.assertNumQueries(0):
+            found = get_many_thumbnails(
+                [post.image for post in self.posts],
+                settings.POST_LIST_THUMBNAIL,
+                LIST_THUMBNAIL_OPTIONS,
+            )
+        self.assertEqual(get_many.call_count, 1)
+        self.assertEqual(
+            [found[post.image.name].url for post in self.posts],
+            [thumbnail.url for thumbnail in thumbnails],
+        )
+
+    # Проверка, что недостающие миниатюры строятся в фоне
+    @override_settings(TASKS_ALWAYS_EAGER=False)
+    def test_missing_thumbnails_deferred(self):
+        with mock.patch(
+            'posts.thumbnails.generate_list_thumbnails.delay'
+        ) as delay:
+            response = self.guest_client.get(reverse('posts:index'))
+        self.assertNotContains(response, '<img class="card-img')
+        delay.assert_called_once_with(
+            sorted(post.image.name for post in self.posts)
+        )
+
+    # Проверка, что ждущие в очереди миниатюры не ставятся повторно
+    @override_settings(TASKS_ALWAYS_EAGER=False)
+    def test_pending_thumbnails_queued_once(self):
+        with mock.patch(
+            'posts.thumbnails.generate_list_thumbnails.delay'
+        ) as delay:
+            self.guest_client.get(reverse('posts:index'))
+            self.guest_client.get(reverse('posts:index'))
+        delay.assert_called_once()
+
+    # Проверка вывода миниатюр после фоновой генерации
+    def test_list_shows_thumbnails(self):
+        self.guest_client.get(reverse('posts:index'))
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertContains(response, '<img class="card-img', count=3)
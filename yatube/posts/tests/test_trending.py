@@ -0,0 +1,126 @@
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.middleware import page_cache_version
+from posts.models import Comment, Group, Post
+from posts.trending import (
+    EMPTY, TRENDING_KEY, TRENDING_STATE_KEY, decay, get_trending,
+    refresh_trending,
+)
+
+User = get_user_model()
+
+HOUR = 60 * 60
+
+
+@override_settings(TRENDING_HALF_LIFE=HOUR, TRENDING_SIZE=2)
+class TrendingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.quiet = Group.objects.create(
+            title='Тихая группа', slug='quiet', description='описание'
+        )
+        cls.busy = Group.objects.create(
+            title='Активная группа', slug='busy', description='описание'
+        )
+
+    def setUp(self):
+        cache.clear()
+        caches['state'].clear()
+        local_copy = mock.patch('posts.trending._local_copy', None)
+        local_copy.start()
+        self.addCleanup(local_copy.stop)
+        self.guest_client = Client()
+        self.now = timezone.now()
+
+    def create_post(self, text, group=None, hours_ago=0):
+        post = Post.objects.create(text=text, author=self.user, group=group)
+        Post.objects.filter(pk=post.pk).update(
+            pub_date=self.now - timedelta(hours=hours_ago)
+        )
+        return post
+
+    # Проверка, что пересчёт с тем же порядком не сбрасывает кеш страниц
+    def test_same_ranking_keeps_page_cache(self):
+        self.create_post('Обычный пост', self.quiet)
+        self.create_post('Ещё пост', self.busy, hours_ago=1)
+        refresh_trending(self.now)
+        version = page_cache_version()
+        trending = refresh_trending(self.now + timedelta(minutes=5))
+        self.assertEqual(len(trending['posts']), 2)
+        self.assertEqual(page_cache_version(), version)
+
+    # Проверка ранжирования постов и групп
+    def test_ranking(self):
+        plain = self.create_post('Обычный пост', self.quiet)
+        discussed = self.create_post('Обсуждаемый пост', self.busy)
+        self.create_post('Старый пост', self.busy, hours_ago=100)
+        self.create_post('Ещё пост', self.busy, hours_ago=1)
+        Comment.objects.create(post=discussed, author=self.user, text='К')
+        trending = refresh_trending(self.now)
+        self.assertEqual(
+            [item['id'] for item in trending['posts']],
+            [discussed.pk, plain.pk],
+        )
+        self.assertEqual(
+            [group['slug'] for group in trending['groups']],
+            ['busy', 'quiet'],
+        )
+        self.assertEqual(trending['groups'][0]['score'], 1.5)
+
+    # Проверка, что повторный запуск учитывает только новые посты
+    def test_incremental_refresh(self):
+        self.create_post('Первый', self.quiet)
+        refresh_trending(self.now)
+        later = self.now + timedelta(hours=2)
+        self.now = later
+        self.create_post('Второй', self.quiet)
+        with self.assertNumQueries(2):
+            trending = refresh_trending(later)
+        self.assertEqual(trending['groups'][0]['score'], round(1.25, 2))
+        state = caches['state'].get(TRENDING_STATE_KEY)
+        self.assertEqual(state['last_id'], Post.objects.latest('pk').pk)
+        self.assertAlmostEqual(state['groups'][self.quiet.pk], 1.25)
+
+    # Проверка затухания
+    def test_decay(self):
+        self.assertEqual(decay(timedelta(hours=2)), 0.25)
+
+    # Проверка, что рейтинг на главной не добавляет запросов
+    def test_index_reads_cache(self):
+        post = self.create_post('Популярный пост', self.busy)
+        with self.assertNumQueries(3):
+            self.guest_client.get(reverse('posts:index'))
+        call_command('refresh_trending', stdout=StringIO())
+        self.assertEqual(get_trending()['posts'][0]['id'], post.pk)
+        with self.assertNumQueries(3):
+            response = self.guest_client.get(reverse('posts:index'))
+        self.assertContains(response, 'Популярные записи')
+        self.assertContains(response, 'Активная группа')
+
+    # Проверка, что рейтинг берётся из памяти процесса до истечения таймаута
+    @override_settings(TRENDING_LOCAL_TIMEOUT=60)
+    def test_local_copy(self):
+        post = self.create_post('Популярный пост', self.busy)
+        refresh_trending(self.now)
+        state = caches['state']
+        with mock.patch.object(state, 'get') as get:
+            self.assertEqual(get_trending()['posts'][0]['id'], post.pk)
+        get.assert_not_called()
+        state.set(TRENDING_KEY, EMPTY, None)
+        self.assertEqual(get_trending()['posts'][0]['id'], post.pk)
+        with mock.patch('posts.trending.time.monotonic', return_value=(
+            time.monotonic() + 61
+        )):
+            self.assertEqual(get_trending(), EMPTY)
@@ -0,0 +1,109 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from sorl.thumbnail import default, get_thumbnail
+from sorl.thumbnail.conf import defaults as sorl_defaults
+from sorl.thumbnail.conf import settings as sorl_settings
+from sorl.thumbnail.images import ImageFile, deserialize_image_file
+from sorl.thumbnail.kvstores.base import add_prefix
+from sorl.thumbnail.kvstores.cached_db_kvstore import EMPTY_VALUE
+
+from core.tasks import task
+from posts.models import Post
+
+LIST_THUMBNAIL_OPTIONS = {'crop': 'center', 'upscale': True}
+
+
+def thumbnail_key(image, geometry, options):
+    """Ключ миниатюры в key-value хранилище sorl.
+
+    Повторяет вычисление имени из ThumbnailBackend.get_thumbnail, но без
+    обращения к хранилищу и к самому key-value хранилищу.
+    """
+    backend = default.backend
+    source = ImageFile(image)
+    options = dict(options)
+    if sorl_settings.THUMBNAIL_PRESERVE_FORMAT:
+        options.setdefault('format', backend._get_format(source))
+    for key, value in backend.default_options.items():
+        options.setdefault(key, value)
+    for key, attr in backend.extra_options:
+        value = getattr(sorl_settings, attr)
+        if value != getattr(sorl_defaults, attr):
+            options.setdefault(key, value)
+    name = backend._get_thumbnail_filename(source, geometry, options)
+    return ImageFile(name, default.storage).key
+
+
+def get_many_thumbnails(images, geometry, options):
+    """Находит готовые миниатюры для набора картинок.
+
+    Для cached_db-хранилища sorl все ключи читаются одним get_many из
+    кеша. Возвращает словарь {имя картинки: ImageFile}; картинок без
+    готовой миниатюры в нём нет.
+    """
+    keys = {
+        add_prefix(thumbnail_key(image, geometry, options)): image.name
+        for image in images
+    }
+    kvstore = default.kvstore
+    if hasattr(kvstore, 'cache'):
+        values = kvstore.cache.get_many(list(keys))
+    else:
+        values = {key: kvstore._get_raw(key) for key in keys}
+    return {
+        keys[key]: deserialize_image_file(value)
+        for key, value in values.items()
+        if value is not None and value != EMPTY_VALUE
+    }
+
+
+def pending_key(name):
+    return 'thumb-pending:' + hashlib.md5(name.encode()).hexdigest()
+
+
+def attach_list_thumbnails(posts):
+    """Добавляет постам страницы атрибут list_thumbnail.
+
+    Отсутствующие миниатюры не создаются во время запроса: их построение
+    ставится в очередь одной фоновой задачей, а пост пока выводится без
+    картинки. Картинка, уже ждущая в очереди, повторно не ставится, пока
+    не истечёт POST_LIST_THUMBNAIL_PENDING_TIMEOUT.
+    """
+    posts = [post for post in posts if post.image]
+    if not posts:
+        return
+    geometry = settings.POST_LIST_THUMBNAIL
+    found = get_many_thumbnails(
+        [post.image for post in posts], geometry, LIST_THUMBNAIL_OPTIONS
+    )
+    missing = set()
+    for post in posts:
+        post.list_thumbnail = found.get(post.image.name)
+        if post.list_thumbnail is None:
+            missing.add(post.image.name)
+    missing = [
+        name for name in sorted(missing)
+        if cache.add(
+            pending_key(name), True,
+            settings.POST_LIST_THUMBNAIL_PENDING_TIMEOUT,
+        )
+    ]
+    if missing:
+        generate_list_thumbnails.delay(missing)
+
+
+@task
+def generate_list_thumbnails(names):
+    storage = Post._meta.get_field('image').storage
+    try:
+        for name in names:
+            if storage.exists(name):
+                get_thumbnail(
+                    ImageFile(name, storage),
+                    settings.POST_LIST_THUMBNAIL,
+                    **LIST_THUMBNAIL_OPTIONS
+                )
+    finally:
+        cache.delete_many([pending_key(name) for name in names])
@@ -0,0 +1,156 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.text import Truncator
+
+from posts.middleware import invalidate_pages
+from posts.models import Group, Post
+
+TRENDING_KEY = 'trending'
+TRENDING_STATE_KEY = 'trending:state'
+COMMENT_WEIGHT = 3
+VIEW_WEIGHT = 0.1
+# Посты старше HORIZON периодов полураспада в рейтинг не попадают
+HORIZON = 8
+EMPTY = {'posts': [], 'groups': []}
+
+# Копия рейтинга в памяти процесса: (рейтинг, когда она устареет)
+_local_copy = None
+
+
+def decay(age):
+    return 0.5 ** (age.total_seconds() / settings.TRENDING_HALF_LIFE)
+
+
+def post_score(post, now):
+    engagement = (
+        1 + COMMENT_WEIGHT * post.comments_count + VIEW_WEIGHT * post.views
+    )
+    return engagement * decay(now - post.pub_date)
+
+
+def get_trending():
+    """Популярные посты и группы.
+
+    Кеш 'state' хранится в базе, поэтому рейтинг читается из него не чаще
+    раза в TRENDING_LOCAL_TIMEOUT секунд, а в остальное время берётся из
+    памяти процесса без обращения к базе. Другие процессы видят новый
+    рейтинг с задержкой до этого таймаута.
+    """
+    if _local_copy is not None and _local_copy[1] > time.monotonic():
+        return _local_copy[0]
+    trending = caches['state'].get(TRENDING_KEY) or EMPTY
+    remember(trending)
+    return trending
+
+
+def remember(trending):
+    global _local_copy
+    _local_copy = (
+        trending, time.monotonic() + settings.TRENDING_LOCAL_TIMEOUT
+    )
+
+
+def refresh_trending(now=None):
+    """Пересчитывает рейтинг по постам, появившимся с прошлого запуска.
+
+    Рейтинг группы — сумма затухающих вкладов её постов: прошлые значения
+    умножаются на коэффициент затухания за прошедшее время, и к ним
+    добавляются вклады новых постов. Для постов хранится короткий список
+    кандидатов, которые пересчитываются вместе с новыми постами. Готовый
+    топ кладётся в кеш, откуда его читает главная страница.
+    """
+    now = now or timezone.now()
+    state = caches['state'].get(TRENDING_STATE_KEY) or {
+        'last_id': 0,
+        'updated': now,
+        'candidates': [],
+        'groups': {},
+    }
+    horizon = now - timedelta(seconds=settings.TRENDING_HALF_LIFE * HORIZON)
+    posts = list(
+        Post.objects.filter(
+            Q(pk__in=state['candidates'])
+            | Q(pk__gt=state['last_id'], pub_date__gte=horizon)
+        ).select_related('author').only(
+            'excerpt', 'pub_date', 'group_id', 'comments_count', 'views',
+            'author__username',
+        )
+    )
+    new_posts = [post for post in posts if post.pk > state['last_id']]
+
+    group_decay = decay(now - state['updated'])
+    groups = {
+        group_id: score * group_decay
+        for group_id, score in state['groups'].items()
+    }
+    for post in new_posts:
+        if post.group_id is not None:
+            groups[post.group_id] = (
+                groups.get(post.group_id, 0) + decay(now - post.pub_date)
+            )
+    scored = sorted(
+        ((post_score(post, now), post) for post in posts
+         if post.pub_date >= horizon),
+        key=lambda item: item[0],
+        reverse=True,
+    )
+    top_groups = sorted(groups.items(), key=lambda item: -item[1])[
+        :settings.TRENDING_SIZE
+    ]
+    titles = Group.objects.in_bulk([group_id for group_id, _ in top_groups])
+
+    caches['state'].set(TRENDING_STATE_KEY, {
+        'last_id': max(
+            (post.pk for post in new_posts), default=state['last_id']
+        ),
+        'updated': now,
+        'candidates': [
+            post.pk for _, post in scored[:settings.TRENDING_CANDIDATES]
+        ],
+        'groups': groups,
+    }, None)
+    trending = {
+        'posts': [
+            {
+                'id': post.pk,
+                'text': Truncator(post.excerpt).chars(80),
+                'author': post.author.username,
+                'score': round(score, 2),
+            }
+            for score, post in scored[:settings.TRENDING_SIZE]
+        ],
+        'groups': [
+            {
+                'slug': titles[group_id].slug,
+                'title': titles[group_id].title,
+                'score': round(score, 2),
+            }
+            for group_id, score in top_groups
+            if group_id in titles
+        ],
+    }
+    previous = caches['state'].get(TRENDING_KEY)
+    caches['state'].set(TRENDING_KEY, trending, None)
+    remember(trending)
+    if previous is None or displayed(trending) != displayed(previous):
+        invalidate_pages()
+    return trending
+
+
+def displayed(trending):
+    """Рейтинг в том виде, в каком его выводит includes/trending.html.
+
+    Очки убывают при каждом пересчёте, поэтому в сравнение не входят.
+    """
+    return {
+        section: [
+            {key: value for key, value in item.items() if key != 'score'}
+            for item in items
+        ]
+        for section, items in trending.items()
+    }
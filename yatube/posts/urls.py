@@ -1,4 +1,4 @@
-from django.urls import path
+from django.urls import path, re_path
 from django.conf import settings
 from django.conf.urls.static import static
 
@@ -10,11 +10,53 @@ app_name = 'posts'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('group/', views.group_index, name='group_index'),
     path('group/<slug:slug>/', views.group_posts, name='group_list'),
+    path(
+        'archive/<int:year>/',
+        views.date_archive,
+        name='date_archive',
+    ),
+    path(
+        'archive/<int:year>/<int:month>/',
+        views.date_archive,
+        name='date_archive',
+    ),
+    path(
+        'group/<slug:slug>/archive/<int:year>/',
+        views.date_archive,
+        name='group_date_archive',
+    ),
+    path(
+        'group/<slug:slug>/archive/<int:year>/<int:month>/',
+        views.date_archive,
+        name='group_date_archive',
+    ),
+    path('follow/', views.follow_index, name='follow_index'),
     path('profile/<str:username>/', views.profile, name='profile'),
+    path(
+        'profile/<str:username>/follow/',
+        views.profile_follow,
+        name='profile_follow',
+    ),
+    path(
+        'profile/<str:username>/unfollow/',
+        views.profile_unfollow,
+        name='profile_unfollow',
+    ),
     path('create/', views.post_create, name='post_create'),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
+    re_path(
+        r'^(?P<name>sitemap(?:-[a-z]+-\d+)?\.xml)$',
+        views.sitemap,
+        name='sitemap',
+    ),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
+    path(
+        'posts/<int:post_id>/comment/',
+        views.add_comment,
+        name='add_comment',
+    ),
 ]
 
 if settings.DEBUG:
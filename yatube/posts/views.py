@@ -1,26 +1,93 @@
+import os
+
 from django.core.paginator import Paginator
+from django.db.models import Prefetch
+from django.http import FileResponse, Http404
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.models import User
 from django.contrib.auth.decorators import login_required
 from django.conf import settings
 
-from posts.models import Post, Group
-from posts.forms import PostForm
+from core.streaming import stream_list
+from posts.archive import TieredPosts
+from posts.cards import attach_cards
+from posts.counters import post_views
+from posts.feed import FollowFeed, follow, unfollow
+from posts.models import ArchivedPost, Comment, Follow, Post, Group
+from posts.forms import CommentForm, PostForm
+from posts.months import month_histogram, month_list, period_range
+from posts.stats import author_stats
+from posts.tasks import post_saved
+from posts.thumbnails import attach_list_thumbnails
+from posts.trending import get_trending
 
 
-def paginator(page_number, posts):
-    paginator = Paginator(posts, settings.POSTS_ON_PAGE)
+def paginator(page_number, posts, per_page=None):
+    paginator = Paginator(posts, per_page or settings.POSTS_ON_PAGE)
     page_obj = paginator.get_page(page_number)
     return page_obj
 
 
+def render_list(request, template, context):
+    """Рендерит страницу со списком постов из context['page_obj'].
+
+    При STREAM_LIST_PAGES страница отдаётся по частям: шапка уходит до
+    запросов за постами страницы. Карточки постов берутся из общего кеша.
+    """
+    page_obj = context['page_obj']
+
+    def prepare(posts):
+        attach_list_thumbnails(posts)
+        attach_cards(posts, context['show_link'])
+
+    if not settings.STREAM_LIST_PAGES:
+        prepare(page_obj)
+        return render(request, template, context)
+    return stream_list(
+        request, template, context, page_obj,
+        item_template='posts/includes/post_card.html',
+        item_name='post',
+        separator='<hr>',
+        prepare=prepare,
+    )
+
+
 def index(request):
     template = 'posts/index.html'
-    posts = Post.objects.select_related('author', 'group')
+    posts = TieredPosts(
+        Post.objects.select_related('author', 'group').defer('text'),
+        ArchivedPost.objects.select_related(
+            'author', 'group'
+        ).defer('text'),
+    )
     page_number = request.GET.get('page')
     page_obj = paginator(page_number, posts)
     context = {
         'page_obj': page_obj,
+        'show_link': True,
+        'trending': get_trending(),
+    }
+    return render_list(request, template, context)
+
+
+GROUP_ORDERING = {
+    'activity': ('-last_post_date', 'title'),
+    'size': ('-posts_count', 'title'),
+    'title': ('title',),
+}
+
+
+def group_index(request):
+    template = 'posts/group_index.html'
+    sort = request.GET.get('sort')
+    if sort not in GROUP_ORDERING:
+        sort = 'activity'
+    groups = Group.objects.order_by(*GROUP_ORDERING[sort])
+    page_number = request.GET.get('page')
+    page_obj = paginator(page_number, groups)
+    context = {
+        'page_obj': page_obj,
+        'sort': sort,
     }
     return render(request, template, context)
 
@@ -28,41 +95,121 @@ def index(request):
 def group_posts(request, slug):
     template = 'posts/group_list.html'
     group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.select_related('author')
+    posts = TieredPosts(
+        group.posts.select_related('author').defer('text'),
+        group.archived_posts.select_related('author').defer('text'),
+    )
     page_number = request.GET.get('page')
     page_obj = paginator(page_number, posts)
     context = {
         'group': group,
         'page_obj': page_obj,
+        'show_link': False,
     }
-    return render(request, template, context)
+    return render_list(request, template, context)
+
+
+def date_archive(request, year, month=None, slug=None):
+    template = 'posts/date_archive.html'
+    try:
+        start, end = period_range(year, month)
+    except (ValueError, OverflowError):
+        raise Http404('Нет такого месяца')
+    group = get_object_or_404(Group, slug=slug) if slug else None
+    hot = Post.objects.select_related('author', 'group').defer('text')
+    archive = ArchivedPost.objects.select_related(
+        'author', 'group'
+    ).defer('text')
+    if group is not None:
+        hot = hot.filter(group=group)
+        archive = archive.filter(group=group)
+    posts = TieredPosts(
+        hot.filter(pub_date__gte=start, pub_date__lt=end),
+        archive.filter(pub_date__gte=start, pub_date__lt=end),
+    )
+    page_number = request.GET.get('page')
+    page_obj = paginator(page_number, posts)
+    context = {
+        'group': group,
+        'period': start,
+        'month': month,
+        'months': month_list(month_histogram(group and group.pk)),
+        'page_obj': page_obj,
+        'show_link': group is None,
+    }
+    return render_list(request, template, context)
 
 
 def profile(request, username):
     template = 'posts/profile.html'
     author = get_object_or_404(User, username=username)
-    posts = author.posts.select_related('group')
+    posts = TieredPosts(
+        author.posts.select_related('group').defer('text'),
+        author.archived_posts.select_related('group').defer('text'),
+    )
     page_number = request.GET.get('page')
     page_obj = paginator(page_number, posts)
+    following = (
+        request.user.is_authenticated
+        and request.user != author
+        and Follow.objects.filter(user=request.user, author=author).exists()
+    )
     context = {
         'author': author,
         'page_obj': page_obj,
+        'show_link': True,
+        'stats': author_stats(author),
+        'following': following,
     }
-    return render(request, template, context)
+    return render_list(request, template, context)
 
 
 def post_detail(request, post_id):
     template = 'posts/post_detail.html'
-    post = get_object_or_404(
-        Post.objects.select_related('group', 'author'),
+    post = Post.objects.select_related('group', 'author').filter(
         id=post_id,
+    ).first()
+    if post is None:
+        post = get_object_or_404(
+            ArchivedPost.objects.select_related('group', 'author'),
+            id=post_id,
+        )
+    else:
+        post_views.record(post.pk)
+    comments = Comment.objects.filter(
+        post_id=post.id, parent=None
+    ).select_related('author').prefetch_related(
+        Prefetch(
+            'replies',
+            queryset=Comment.objects.select_related('author'),
+        )
     )
+    page_number = request.GET.get('page')
     context = {
         'post': post,
+        'comments': paginator(
+            page_number, comments, settings.COMMENTS_ON_PAGE
+        ),
+        'form': CommentForm(),
     }
     return render(request, template, context)
 
 
+@login_required
+def add_comment(request, post_id):
+    post = get_object_or_404(Post.objects.only('pk'), pk=post_id)
+    form = CommentForm(request.POST or None)
+    if form.is_valid():
+        comment = form.save(commit=False)
+        comment.author = request.user
+        comment.post = post
+        comment.parent = Comment.objects.filter(
+            post=post, parent=None, pk=form.cleaned_data['parent'],
+        ).first()
+        comment.save()
+    return redirect('posts:post_detail', post_id)
+
+
 @login_required
 def post_create(request):
     template = 'posts/create_post.html'
@@ -74,6 +221,7 @@ def post_create(request):
         post = form.save(commit=False)
         post.author = request.user
         post.save()
+        post_saved.delay(post.pk, created=True)
         return redirect('posts:profile', request.user.username)
     return render(request, template, context)
 
@@ -97,5 +245,45 @@ def post_edit(request, post_id):
     }
     if form.is_valid():
         form.save()
+        post_saved.delay(post.pk)
         return redirect('posts:post_detail', post_id)
     return render(request, template, context)
+
+
+@login_required
+def follow_index(request):
+    template = 'posts/follow.html'
+    page_number = request.GET.get('page')
+    page_obj = paginator(page_number, FollowFeed(request.user))
+    context = {
+        'page_obj': page_obj,
+        'show_link': True,
+    }
+    return render_list(request, template, context)
+
+
+@login_required
+def profile_follow(request, username):
+    author = get_object_or_404(User, username=username)
+    follow(request.user, author)
+    return redirect('posts:profile', username)
+
+
+@login_required
+def profile_unfollow(request, username):
+    author = get_object_or_404(User, username=username)
+    unfollow(request.user, author)
+    return redirect('posts:profile', username)
+
+
+def sitemap(request, name):
+    """Отдаёт файл карты сайта, собранный командой build_sitemaps.
+
+    Имя ограничено шаблоном URL, поэтому выйти за SITEMAP_ROOT нельзя. Если
+    веб-сервер отдаёт SITEMAP_ROOT сам, до этой функции запросы не доходят.
+    """
+    try:
+        sitemap_file = open(os.path.join(settings.SITEMAP_ROOT, name), 'rb')
+    except FileNotFoundError:
+        raise Http404('Нет такой карты сайта')
+    return FileResponse(sitemap_file, content_type='application/xml')
@@ -52,11 +52,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.SlowQueryMiddleware',
+    'posts.middleware.AnonymousPageCacheMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -66,7 +70,7 @@ ROOT_URLCONF = 'yatube.urls'
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.templates.InstrumentedDjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -135,16 +139,139 @@ STATIC_URL = '/static/'
 
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 
+# Кеши общие для всех процессов и хранятся в базе (таблицы создаёт
+# manage.py createcachetable). В default — то, что можно построить
+# заново: страницы, карточки, миниатюры, статистика; при переполнении
+# часть записей удаляется. В state — рейтинг и версии кеша страниц,
+# записей там немного, и они не вытесняются.
+CACHES = {
+    'default': {
+        'BACKEND': 'core.cache.InstrumentedDatabaseCache',
+        'LOCATION': 'yatube_cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 50000,
+        },
+    },
+    'state': {
+        'BACKEND': 'core.cache.InstrumentedDatabaseCache',
+        'LOCATION': 'yatube_state',
+        'TIMEOUT': None,
+        'OPTIONS': {
+            'MAX_ENTRIES': 10 ** 9,
+        },
+    },
+}
+
+# Страницы для анонимных посетителей: сколько хранятся в кеше
+# и сколько их могут хранить браузеры и прокси (max-age)
+PAGE_CACHE_TIMEOUT = 60 * 10
+PAGE_CACHE_MAX_AGE = 60
+
 POSTS_ON_PAGE = 10
+# Списки постов отдаются по частям (StreamingHttpResponse). Включается
+# для развёртывания переменной окружения STREAM_LIST_PAGES=1: тестовому
+# клиенту нужен response.context, которого у потокового ответа нет
+STREAM_LIST_PAGES = os.getenv('STREAM_LIST_PAGES') == '1'
+COMMENTS_ON_PAGE = 20
+# Сколько хранятся в кеше карточки постов для списков (0 — не кешировать)
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+AUTHOR_STATS_CACHE_TIMEOUT = 60 * 60 * 24
+MONTH_HISTOGRAM_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Просмотры постов копятся в памяти процесса и записываются в базу
+# одним UPDATE не чаще раза в POST_VIEWS_FLUSH_INTERVAL секунд
+POST_VIEWS_FLUSH_INTERVAL = 10
+POST_VIEWS_FLUSH_BATCH_SIZE = 300
+
+# Рейтинг популярного на главной: вклад поста уменьшается вдвое
+# каждые TRENDING_HALF_LIFE секунд
+TRENDING_HALF_LIFE = 60 * 60 * 6
+TRENDING_SIZE = 5
+TRENDING_CANDIDATES = 100
+TRENDING_REFRESH_INTERVAL = 60 * 5
+# Сколько секунд процесс показывает рейтинг из своей памяти, прежде чем
+# снова прочитать его из кеша в базе
+TRENDING_LOCAL_TIMEOUT = 30
+
+# Начиная с этого числа подписчиков посты автора не раскладываются
+# по лентам, а читаются при показе ленты подписок
+FEED_FANOUT_THRESHOLD = 1000
+FEED_FANOUT_BATCH_SIZE = 1000
+# Сколько последних постов автора попадает в ленту при подписке
+FEED_BACKFILL_POSTS = 50
+
+# Карта сайта собирается командой build_sitemaps по чанкам
+# в SITEMAP_CHUNK_SIZE адресов (ограничение протокола — 50 000)
+SITEMAP_ROOT = os.path.join(BASE_DIR, 'sitemaps')
+SITEMAP_CHUNK_SIZE = 50000
+SITEMAP_BASE_URL = 'http://localhost:8000'
+
+# Профили запросов (cProfile), см. core.middleware.ProfilingMiddleware
+PROFILING_ROOT = os.path.join(BASE_DIR, 'profiles')
+PROFILING_SAMPLE_RATE = 0.0
+
+# Журнал медленных запросов к базе, см. core.slow_queries;
+# None отключает запись
+SLOW_QUERY_THRESHOLD_MS = 100
+SLOW_QUERY_LOG_FILE = os.path.join(BASE_DIR, 'logs', 'slow_queries.log')
+SLOW_QUERY_LOG_MAX_BYTES = 5 * 1024 * 1024
+SLOW_QUERY_LOG_BACKUPS = 3
+
+# Метрики для Prometheus на /metrics/: доступны сотрудникам и по
+# заголовку Authorization: Bearer METRICS_TOKEN. Каждый процесс раз в
+# METRICS_FLUSH_INTERVAL секунд сохраняет свои значения в METRICS_ROOT
+METRICS_ROOT = os.path.join(BASE_DIR, 'metrics')
+METRICS_FLUSH_INTERVAL = 15
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Прогрев шаблонов, URL и модулей при загрузке wsgi.py
+WARMUP_ON_START = True
 
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 # LOGOUT_REDIRECT_URL = 'posts:index'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_BACKEND = 'core.mail.QueuedEmailBackend'
+EMAIL_DELIVERY_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+EMAIL_QUEUE_BATCH_SIZE = 100
+EMAIL_QUEUE_MAX_ATTEMPTS = 5
+EMAIL_QUEUE_FLUSH_INTERVAL = 10
+# Через сколько секунд письма упавшего flush_mail снова можно отправлять
+EMAIL_QUEUE_LOCK_TIMEOUT = 600
 
 SYMBOLS_IN_STR = 15
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+DEFAULT_FILE_STORAGE = 'core.storage.ContentAddressedStorage'
+# Миниатюры sorl-thumbnail хранятся под своими именами
+THUMBNAIL_STORAGE = 'django.core.files.storage.FileSystemStorage'
+
+# Копии картинки поста для srcset: ширины и пропорции кадра
+POST_IMAGE_RENDITIONS = (480, 768, 960)
+POST_IMAGE_RATIO = (960, 339)
+POST_IMAGE_SIZES = '(max-width: 767px) 100vw, 75vw'
+# Миниатюра картинки в списках постов
+POST_LIST_THUMBNAIL = '320x180'
+# Сколько секунд не ставить повторно в очередь построение миниатюры,
+# которое уже ждёт обработчика
+POST_LIST_THUMBNAIL_PENDING_TIMEOUT = 60 * 10
+# Команда clean_media: файлов за проход и возраст, с которого файл
+# без ссылок считается брошенным, секунд
+MEDIA_GC_BATCH_SIZE = 500
+MEDIA_GC_MIN_AGE = 60 * 60
+# Предел объёма для core.storage.InMemoryStorage, байт
+MEDIA_MEMORY_MAX_SIZE = 64 * 1024 * 1024
+
+POSTS_ARCHIVE_AFTER_DAYS = 180
+POSTS_ARCHIVE_BATCH_SIZE = 500
+
+TASKS_ALWAYS_EAGER = False
+TASKS_WORKERS = 4
+TASKS_MAX_ATTEMPTS = 5
+# Задержка перед первой повторной попыткой, секунд; дальше удваивается
+TASKS_RETRY_DELAY = 10
+TASKS_POLL_INTERVAL = 1
+TASKS_LOCK_TIMEOUT = 600
@@ -0,0 +1,60 @@
+"""
+Настройки для прогона тестов.
+
+Отличаются от основных только тем, что ускоряет тесты: быстрый хешер
+паролей, база и файлы в памяти, почта и кеш в памяти процесса.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+
+DEFAULT_FILE_STORAGE = 'core.storage.InMemoryStorage'
+THUMBNAIL_STORAGE = DEFAULT_FILE_STORAGE
+
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+EMAIL_DELIVERY_BACKEND = EMAIL_BACKEND
+
+CACHES = {
+    'default': {
+        'BACKEND': 'core.cache.InstrumentedLocMemCache',
+    },
+    'state': {
+        'BACKEND': 'core.cache.InstrumentedLocMemCache',
+        'LOCATION': 'state',
+    },
+}
+
+TASKS_ALWAYS_EAGER = True
+
+# Просмотры записываются только явным вызовом post_views.flush()
+POST_VIEWS_FLUSH_INTERVAL = None
+
+# Кеш страниц включается только в тестах самого кеша
+PAGE_CACHE_TIMEOUT = 0
+
+# Карточки постов кешируются только в тестах их кеша
+POST_CARD_CACHE_TIMEOUT = 0
+
+# Рейтинг популярного читается из кеша при каждом показе, кроме тестов
+# копии в памяти процесса
+TRENDING_LOCAL_TIMEOUT = 0
+
+# Тестовому клиенту нужен response.context, который есть только
+# у обычного ответа
+STREAM_LIST_PAGES = False
+
+# Журнал медленных запросов включается только в его тестах
+SLOW_QUERY_THRESHOLD_MS = None
+
+# Снимки метрик пишутся на диск только в их тестах
+METRICS_FLUSH_INTERVAL = None